@@ -3,9 +3,382 @@
 import tkinter as tk  # The core library for creating the graphical user interface (GUI).
 from tkinter import ttk, filedialog, messagebox, colorchooser, simpledialog # More advanced widgets and standard dialogs.
 from PIL import Image, ImageTk, ImageDraw, ImageFont, ImageFilter # The Python Imaging Library (Pillow) for all image manipulation.
+import PIL # Only used to check which Pillow build is installed (see PILLOW_SIMD below).
 import os # Provides functions for interacting with the operating system, like getting file names.
+import sys # Used to detect which operating system we are running on (to know where its fonts live).
 import random # Used for generating random numbers for scale, rotation, and placement.
-import matplotlib.font_manager as fm # Used specifically to find system fonts for the title engine.
+import json # Used to save the scanned font list to disk between runs.
+import hashlib # Used to build a fingerprint of the font folders, to know when the saved font list is out of date.
+import struct # Used to read the font name directly from the binary TrueType file.
+import math # Used for the rotation math when planning asset placement.
+import time # Used to find saved background copies that haven't been used for a long time.
+import numpy as np # Fast number arrays, used to plan all asset instances in one pass.
+from collections import OrderedDict # An ordered dictionary, used as a small "least recently used" (LRU) cache.
+from concurrent.futures import ThreadPoolExecutor # Runs the asset resizing/rotating on several CPU cores at once.
+# NOTE: matplotlib's font_manager is only imported when it is actually needed (see _get_font), because importing it is slow.
+
+# Numba (optional) compiles plain-Python number crunching to fast machine code.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit when Numba isn't installed: leaves the function as normal Python."""
+        return lambda func: func
+
+# Pillow-SIMD is a faster build of Pillow (resize, rotate, blur and compositing use the CPU's vector instructions).
+# It is a drop-in replacement, so nothing in this file changes with it:  pip uninstall pillow && pip install pillow-simd
+# Its version numbers end in ".postN" (e.g. "9.5.0.post1"), which is how it is recognized here.
+PILLOW_SIMD = ".post" in PIL.__version__ or "simd" in PIL.__version__.lower()
+
+# === SETTINGS & HELPER FUNCTIONS ===
+# The checkbox images shown in the asset lists, as base64-encoded 16x16 PNG files.
+# They never change, so they are stored here ready-made instead of being drawn with Pillow on every startup.
+_CHECK_PNG_B64 = (  # A blue box with a white checkmark.
+    "iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAYAAAAf8/9hAAAAZklEQVR42mNgGGjAiMT+T44+FmRRuQmEzXhUwIjCZyLFuQ/zMcWYSNX8//9/8l3AwMDA"
+    "wMhIhhewOR2vAcgakNnyEzHVsuDSjG4rNs1YXYBNIS7NOL2ATwNJKfH///8YoY5F31AHAG1aF7n4jA6ZAAAAAElFTkSuQmCC"
+)
+_UNCHECK_PNG_B64 = (  # An empty box.
+    "iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAYAAAAf8/9hAAAAJklEQVR42mNgGGjAiMT+T6Y+kg1AUcdEqRdGDRgWBrCQmZiGEwAA91IEExsiFUAAAAAASUVORK5CYII="
+)
+# How many loaded fonts (one per font name + size combination) to keep in memory at once.
+FONT_CACHE_SIZE = 64
+# How many preview thumbnails (one per display size) of the image on screen to keep, for quick redraws.
+THUMB_CACHE_SIZE = 4
+# Where the list of system fonts is saved, so it doesn't have to be re-scanned on every startup.
+FONT_LIST_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".scene_editor", "fonts.json")
+# Where shrunk copies of large backgrounds are kept, so opening the same file again doesn't have to shrink it again.
+WORKING_COPY_DIR = os.path.join(os.path.expanduser("~"), ".scene_editor", "backgrounds")
+WORKING_COPY_MAX_FILES = 50    # Only the most recently used copies are kept...
+WORKING_COPY_MAX_AGE_DAYS = 90 # ...and none that haven't been used for this long.
+# The area each placement option allows, as fractions of the canvas: (left, right, top, bottom).
+PLACEMENT_ZONES = {
+    "Anywhere": (0.0, 1.0, 0.0, 1.0),
+    "Top Half": (0.0, 1.0, 0.0, 0.5), "Bottom Half": (0.0, 1.0, 0.5, 1.0),
+    "Left Half": (0.0, 0.5, 0.0, 1.0), "Right Half": (0.5, 1.0, 0.0, 1.0),
+}
+
+@njit(cache=True)
+def _plan_instances(rand, src_w, src_h, zones, W, H, scale_min, scale_max, rot_min, rot_max):
+    """
+    Works out the size, rotation and position of every asset instance in a single pass.
+    - rand: (n, 4) array of random numbers in [0, 1), one row per instance (used for scale, angle, x and y).
+    - src_w, src_h: (n,) original asset sizes. zones: (n, 4) placement areas from PLACEMENT_ZONES.
+    Returns two arrays: an (n, 7) integer array of [resized w, resized h, rotated w, rotated h, x, y, ok],
+    where ok is 0 if the instance is too small to draw, and an (n,) array of rotation angles.
+    """
+    n = rand.shape[0]
+    plan = np.zeros((n, 7), dtype=np.int64)
+    angles = np.zeros(n)
+    for i in range(n):
+        # Scale and rotation are picked uniformly between their min and max.
+        scale = scale_min + (scale_max - scale_min) * rand[i, 0]
+        angle = rot_min + (rot_max - rot_min) * rand[i, 1]
+        w = int(src_w[i] * scale)
+        h = int(src_h[i] * scale)
+        if w < 1 or h < 1: continue
+
+        # Size after rotation. This is the same calculation Image.rotate(expand=True) does, so it matches exactly.
+        a = angle % 360.0
+        if a == 0.0 or a == 180.0:
+            rw, rh = w, h
+        elif a == 90.0 or a == 270.0:
+            rw, rh = h, w
+        else:
+            rad = -math.radians(angle)
+            cos_a, sin_a = round(math.cos(rad), 15), round(math.sin(rad), 15)
+            # Pillow rotates around the image center, so the corners are shifted by this offset.
+            cx, cy = w / 2.0, h / 2.0
+            tx = cos_a * -cx + sin_a * -cy + cx
+            ty = -sin_a * -cx + cos_a * -cy + cy
+            min_x = max_x = tx
+            min_y = max_y = ty
+            for corner_x, corner_y in ((w, 0), (w, h), (0, h)):
+                px = cos_a * corner_x + sin_a * corner_y + tx
+                py = -sin_a * corner_x + cos_a * corner_y + ty
+                min_x, max_x = min(min_x, px), max(max_x, px)
+                min_y, max_y = min(min_y, py), max(max_y, py)
+            rw = math.ceil(max_x) - math.floor(min_x)
+            rh = math.ceil(max_y) - math.floor(min_y)
+
+        # Random position inside the placement zone. The asset must fit, so the zone shrinks by its size.
+        x0, x1 = int(zones[i, 0] * W), int(zones[i, 1] * W)
+        y0, y1 = int(zones[i, 2] * H), int(zones[i, 3] * H)
+        x_max, y_max = max(x0, x1 - rw), max(y0, y1 - rh)
+        plan[i, 0], plan[i, 1], plan[i, 2], plan[i, 3] = w, h, rw, rh
+        plan[i, 4] = x0 + int(rand[i, 2] * (x_max - x0 + 1))
+        plan[i, 5] = y0 + int(rand[i, 3] * (y_max - y0 + 1))
+        plan[i, 6] = 1
+        angles[i] = angle
+    return plan, angles
+
+def _split_rgba(image):
+    """
+    Splits an RGBA PIL image into two separate, contiguous arrays: colors (h, w, 3) and alpha (h, w).
+    With alpha in its own array, the blending code reads it as one straight run of bytes instead of every 4th byte.
+    """
+    arr = np.asarray(image)
+    return arr[..., :3].copy(), arr[..., 3].copy()
+
+def _transform_asset(source, w, h, angle):
+    """
+    Scales the RGBA image 'source' to w x h, rotates it by 'angle' degrees, and returns it split by _split_rgba.
+    Pillow does the heavy work in C without holding Python's lock, so several of these can run in parallel threads.
+    """
+    # With the default settings (no rotation, or a scale of exactly 100%) a step can be skipped completely.
+    image = source
+    if (w, h) != source.size:
+        image = image.resize((w, h), Image.Resampling.LANCZOS)
+    if angle % 360.0 != 0.0:
+        image = image.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
+    return _split_rgba(image)
+
+@njit(cache=True)
+def _div255(v):
+    """
+    Divides by 255 with rounding, like (v + 127) // 255, but with only adds and shifts (division is slow).
+    Exact for every v from 0 to 255 * 255, which covers all the blends below. Works on numbers and on arrays.
+    """
+    t = v + 0x80
+    return (t + (t >> 8)) >> 8
+
+@njit(cache=True)
+def _blit_kernel(dst_rgb, dst_a, src_rgb, src_a, x, y):
+    """
+    Numba version of _blit_over (same arguments, same result), done pixel by pixel so nothing temporary is allocated.
+    """
+    h, w = src_a.shape
+    H, W = dst_a.shape
+    x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, W), min(y + h, H)
+    if x0 >= x1 or y0 >= y1: return
+    for j in range(y0, y1):
+        # Most assets have fully transparent borders and fully opaque middles, so whole rows are often one or the other.
+        row_a = src_a[j - y, x0 - x:x1 - x]
+        if row_a.max() == 0: continue # Fully transparent row: nothing changes.
+        if row_a.min() == 255:
+            # Fully opaque row: the asset simply covers the canvas, so its colors are copied straight over.
+            dst_rgb[j, x0:x1] = src_rgb[j - y, x0 - x:x1 - x]
+            dst_a[j, x0:x1] = 255
+            continue
+        for i in range(x0, x1):
+            a = np.uint16(src_a[j - y, i - x])
+            if a == 0: continue # Fully transparent asset pixel: nothing changes.
+            da = np.uint16(dst_a[j, i])
+            if da == 255:
+                # Opaque canvas (the usual case): color = asset * alpha + canvas * (1 - alpha), rounded.
+                for c in range(3):
+                    dst_rgb[j, i, c] = _div255(np.uint16(src_rgb[j - y, i - x, c]) * a + np.uint16(dst_rgb[j, i, c]) * (255 - a))
+            else:
+                # Partly transparent canvas: the canvas color only counts as much as its own alpha.
+                out_a = np.int64(a) * 255 + np.int64(da) * (255 - a) # Resulting alpha, times 255 (never 0 here, since a > 0).
+                for c in range(3):
+                    color = np.int64(src_rgb[j - y, i - x, c]) * a * 255 + np.int64(dst_rgb[j, i, c]) * da * (255 - a)
+                    dst_rgb[j, i, c] = (color + out_a // 2) // out_a
+                dst_a[j, i] = _div255(out_a)
+
+def _blit_over(dst_rgb, dst_a, src_rgb, src_a, x, y):
+    """
+    Blends an asset onto the canvas with its top-left corner at (x, y), using the standard "over" rule.
+    Both are given as separate color (h, w, 3) and alpha (h, w) uint8 arrays (see _split_rgba).
+    Parts of the asset that fall outside the canvas are ignored. The canvas arrays are changed in place.
+    """
+    h, w = src_a.shape
+    H, W = dst_a.shape
+    # Clip the asset to the canvas.
+    x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, W), min(y + h, H)
+    if x0 >= x1 or y0 >= y1: return
+    # 16 bits is enough for the usual blend below (at most 255 * 255 + 128).
+    s = src_rgb[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.uint16)
+    a = src_a[y0 - y:y1 - y, x0 - x:x1 - x, None].astype(np.uint16) # Kept as a (h, w, 1) column so it multiplies all three color channels.
+    d = dst_rgb[y0:y1, x0:x1]
+    da = dst_a[y0:y1, x0:x1, None]
+    if da.min() == 255:
+        # Opaque canvas (the usual case): color = asset * alpha + canvas * (1 - alpha), rounded.
+        d[...] = _div255(s * a + d * (255 - a))
+    else:
+        s, a, da = s.astype(np.uint32), a.astype(np.uint32), da.astype(np.uint32)
+        # Partly transparent canvas: the canvas color only counts as much as its own alpha.
+        out_a = a * 255 + da * (255 - a) # Resulting alpha, times 255.
+        color = s * a * 255 + d * da * (255 - a)
+        # Where both are fully transparent the result is invisible, so the canvas color is just kept.
+        d[...] = np.where(out_a > 0, (color + out_a // 2) // np.maximum(out_a, 1), d)
+        dst_a[y0:y1, x0:x1] = _div255(out_a[..., 0])
+
+def _flatten_on_white(image):
+    """
+    Returns an RGB version of the PIL image 'image', with its transparent parts blended onto white.
+    (Image.convert("RGB") would just drop the transparency, which leaves dark fringes around soft edges.)
+    An image that already is RGB is returned as it is, without a copy.
+    """
+    if image.mode == "RGB":
+        return image
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    arr = np.asarray(image)
+    if arr[..., 3].min() == 255:
+        return Image.fromarray(arr[..., :3].copy(), "RGB") # Fully opaque (the usual case): nothing to blend.
+    # (color * alpha + 255 * (255 - alpha) + 127) // 255, worked out inside one 16-bit buffer instead of
+    # creating a new full-size temporary array for every step.
+    a = arr[..., 3:4].astype(np.uint16)
+    white = 255 * (255 - a) + 127 # Only (h, w, 1): a third of the size of the color buffer.
+    buf = arr[..., :3].astype(np.uint16)
+    np.multiply(buf, a, out=buf)
+    np.add(buf, white, out=buf)
+    np.floor_divide(buf, 255, out=buf)
+    return Image.fromarray(buf.astype(np.uint8), "RGB")
+
+# Use the compiled blending loop when Numba is installed; otherwise the NumPy version is much faster than plain Python loops.
+_blit = _blit_kernel if NUMBA_AVAILABLE else _blit_over
+
+def _font_directories():
+    """Returns the folders where this operating system keeps its fonts."""
+    if sys.platform == "win32":
+        dirs = [os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+                os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts")]
+    elif sys.platform == "darwin":
+        dirs = ["/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+    else:
+        dirs = ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"), os.path.expanduser("~/.local/share/fonts")]
+    return [d for d in dirs if os.path.isdir(d)]
+
+def _read_font_family_name(font_path):
+    """
+    Reads the family name (e.g. "Arial") of a .ttf/.otf file straight from its 'name' table.
+    Only a few hundred bytes are read, instead of loading and parsing the whole font.
+    Returns None if the file has no usable name.
+    """
+    with open(font_path, "rb") as f:
+        # The file starts with a 12-byte header; bytes 4-5 hold the number of tables that follow.
+        header = f.read(12)
+        if len(header) < 12: return None
+        num_tables = struct.unpack(">H", header[4:6])[0]
+        # Each table is described by a 16-byte record: tag, checksum, offset, length. Find the 'name' table.
+        table_records = f.read(16 * num_tables)
+        for i in range(len(table_records) // 16):
+            tag, _checksum, table_offset, _length = struct.unpack_from(">4sIII", table_records, 16 * i)
+            if tag == b"name": break
+        else:
+            return None
+
+        # The 'name' table: a 6-byte header followed by 12-byte name records.
+        f.seek(table_offset)
+        _format, count, strings_offset = struct.unpack(">HHH", f.read(6))
+        name_records = f.read(12 * count)
+        fallback_name = None
+        for i in range(len(name_records) // 12):
+            platform_id, _encoding_id, language_id, name_id, length, offset = struct.unpack_from(">6H", name_records, 12 * i)
+            if name_id != 1: continue # Name ID 1 is the font family name.
+            f.seek(table_offset + strings_offset + offset)
+            raw = f.read(length)
+            if platform_id in (0, 3): # Unicode and Windows names are stored as UTF-16.
+                name = raw.decode("utf-16-be", errors="ignore")
+                if platform_id == 3 and language_id == 0x409: return name # Windows, US English: the best choice.
+            elif platform_id == 1: # Old Macintosh names use the Mac Roman encoding.
+                name = raw.decode("mac_roman", errors="ignore")
+            else:
+                continue
+            fallback_name = fallback_name or name
+        return fallback_name
+
+def load_system_font_paths():
+    """
+    Returns a dictionary of {font family name: font file path} for all TrueType/OpenType fonts on the system.
+    The result is saved to FONT_LIST_CACHE_PATH together with a fingerprint of the font folders'
+    modification times, so the (slow) scan only happens again after fonts are installed or removed.
+    """
+    # Build the fingerprint. A folder's modification time changes whenever a file is added to or removed from it.
+    font_dirs = _font_directories()
+    fingerprint = hashlib.sha1()
+    for font_dir in font_dirs:
+        for dir_path, _dir_names, _file_names in os.walk(font_dir):
+            fingerprint.update(f"{dir_path}:{os.stat(dir_path).st_mtime_ns};".encode("utf-8", errors="replace"))
+    key = fingerprint.hexdigest()
+
+    # Use the saved list if the font folders haven't changed since it was written.
+    try:
+        with open(FONT_LIST_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            return cached["fonts"]
+    except (OSError, ValueError, KeyError):
+        pass # No saved list yet (or it's unreadable), so scan below.
+
+    # Scan every font file and read its family name. The first file found for each name is used.
+    fonts = {}
+    for font_dir in font_dirs:
+        for dir_path, _dir_names, file_names in os.walk(font_dir):
+            for file_name in file_names:
+                if not file_name.lower().endswith((".ttf", ".otf")): continue
+                font_path = os.path.join(dir_path, file_name)
+                try:
+                    name = _read_font_family_name(font_path)
+                except (OSError, struct.error):
+                    continue # Skip unreadable or damaged font files.
+                if name and name not in fonts:
+                    fonts[name] = font_path
+
+    # Save the list. It's written to a temporary file first and then swapped in, so a crash can't leave a half-written file.
+    try:
+        os.makedirs(os.path.dirname(FONT_LIST_CACHE_PATH), exist_ok=True)
+        tmp_path = FONT_LIST_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "fonts": fonts}, f)
+        os.replace(tmp_path, FONT_LIST_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not save the font list: {e}")
+    return fonts
+
+def _fit_image(image, box_w, box_h):
+    """
+    Returns a copy of 'image' shrunk to fit inside box_w x box_h, keeping its aspect ratio. Never enlarges, like
+    thumbnail(), but the original is never modified so it doesn't need to be copied first. Safe to run on a worker thread.
+    """
+    # First a cheap whole-number shrink (each block of factor x factor pixels is averaged) to near the target size...
+    factor = min(image.width // box_w, image.height // box_h)
+    small = image.reduce(factor) if factor >= 2 else image
+    # ...then the final resize only has to work on that much smaller image.
+    # This is only for the on-screen preview (saving uses the full image), so the faster BILINEAR filter is good enough.
+    ratio = min(box_w / image.width, box_h / image.height, 1.0)
+    new_size = (max(1, round(image.width * ratio)), max(1, round(image.height * ratio)))
+    if new_size != small.size:
+        small = small.resize(new_size, Image.Resampling.BILINEAR)
+    return small
+
+def _working_copy_path(path, max_size):
+    """
+    Returns where the shrunk copy of the background file 'path' (at working resolution 'max_size') is kept.
+    The name is a fingerprint of the file's location, modification time and size, so an edited file gets a new copy.
+    """
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}:{max_size}"
+    return os.path.join(WORKING_COPY_DIR, hashlib.sha1(key.encode("utf-8", errors="replace")).hexdigest() + ".png")
+
+def _save_working_copy(image, copy_path):
+    """Saves a shrunk background to 'copy_path' (see _working_copy_path). Runs on a background thread."""
+    try:
+        os.makedirs(WORKING_COPY_DIR, exist_ok=True)
+        # Written to a temporary file first and then swapped in, so a crash can't leave a half-written file.
+        tmp_path = copy_path + ".tmp"
+        image.save(tmp_path, format="PNG", compress_level=1) # Fast to write; these are only a local cache.
+        os.replace(tmp_path, copy_path)
+    except OSError as e:
+        print(f"Could not save the working copy of the background: {e}")
+
+def prune_working_copies():
+    """Deletes the saved background copies that are too old, and the least recently used ones beyond the limit."""
+    try:
+        entries = [entry for entry in os.scandir(WORKING_COPY_DIR) if entry.name.endswith(".png")]
+    except OSError:
+        return # No copies saved yet.
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True) # Most recently used first.
+    oldest_allowed = time.time() - WORKING_COPY_MAX_AGE_DAYS * 24 * 3600
+    for i, entry in enumerate(entries):
+        if i >= WORKING_COPY_MAX_FILES or entry.stat().st_mtime < oldest_allowed:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass # In use or already gone; it will be tried again next time.
 
 # === 2. MAIN APPLICATION CLASS ===
 # This class encapsulates the entire application, holding its data, UI, and logic.
@@ -24,26 +397,47 @@ class SceneEditorApp:
         # --- Core Data Structures ---
         # These variables hold the state of the application.
         self.background_image = None           # The original, unmodified background PIL Image.
+        self._background_array = None          # The same background as a NumPy array, which is what scenes are composed on.
         self.generated_scene_no_title = None # The PIL Image *after* assets are placed, but *before* the title is added.
                                              # This is CRUCIAL for reapplying the title without re-generating assets.
         self.current_scene_image = None        # The final PIL Image that is currently being displayed (with title).
         self.tk_image = None                   # The Tkinter-compatible version of the displayed image. Must be kept as an instance variable to prevent garbage collection.
+        self.last_seed = None                  # The random seed used by the most recent generation, so the exact same scene can be reproduced.
+        self.background_path = None            # The file the background was loaded from (None for a blank canvas).
+        self.background_full_size = None       # The background's original (width, height), before it was shrunk to the working resolution.
+        self._last_generation = None           # Everything needed to re-create the last generated scene (see _compose_scene).
+        self._last_title_settings = None       # The title settings used for the title currently on screen (None = no title shown).
+        self._check_images = {}                # The two checkbox images ({True: checked, False: unchecked}), created on first use.
+        self._thumb_cache = OrderedDict()      # Preview thumbnails of the image on screen: (image id, width, height) -> PIL Image.
+        self._shown_thumb_key = None           # Which of those thumbnails is in tk_image right now.
+        self._display_pool = ThreadPoolExecutor(max_workers=1) # Makes the preview thumbnails in the background.
+        self._display_seq = 0                  # Counts display_image calls, so a late background preview can tell it's out of date.
+        self._save_pool = ThreadPoolExecutor(max_workers=2) # Writes saved images to disk in the background, so the window doesn't freeze.
+        self._save_cache = None                # (scene on screen, its full-resolution version, that as RGB or None, whether it's fully opaque) from the last save.
+        self._resize_job = None                # The pending redraw after the window was resized (see _on_display_resize).
+        self._label_size = (800, 600)          # The image label's size, updated whenever it changes (so it doesn't have to be asked for).
 
         # --- Font Loading ---
-        # Find all available TrueType fonts on the system. This can be slow, so it's done once at startup.
+        # Find all available TrueType fonts on the system. The list is saved to disk, so only the first startup
+        # (or the first one after fonts were installed/removed) has to scan the font files.
         try:
-            # Get a list of file paths to all .ttf fonts.
-            font_paths = fm.findSystemFonts(fontpaths=None, fontext='ttf')
-            # For each font path, get its family name (e.g., "Arial").
-            # A 'set' is used here to automatically store only the unique names, removing duplicates.
-            unique_font_names = {fm.FontProperties(fname=font_path).get_name() for font_path in font_paths}
-            # Convert the set of unique names back to a list and sort it alphabetically for the dropdown menu.
-            self.system_fonts = sorted(list(unique_font_names))
+            # A dictionary of {family name (e.g. "Arial"): font file path}. Dictionary keys are unique, so there are no duplicates.
+            font_paths_by_name = load_system_font_paths()
+            # Sort the names alphabetically for the dropdown menu.
+            self.system_fonts = sorted(font_paths_by_name)
         except Exception as e:
             # If font scanning fails for any reason, fall back to a safe, default list.
             print(f"Could not load system fonts, falling back to a default list: {e}")
+            font_paths_by_name = {}
             self.system_fonts = ["Arial", "Courier New", "Times New Roman", "Verdana", "Helvetica"]
+        # Tidy up the saved background copies (see load_background).
+        prune_working_copies()
 
+        # --- Font Caches ---
+        # Loading a font parses the whole TrueType file, so loaded fonts are remembered and reused on every title update.
+        self._font_cache = OrderedDict() # (font_name, font_size) -> ImageFont object, oldest entries first.
+        # font_name -> font file path. Pre-filled from the font scan; other names are looked up (slowly) on first use.
+        self._font_path_cache = dict(font_paths_by_name)
 
         # --- Layer Data ---
         # A list of dictionaries, where each dictionary represents one layer.
@@ -68,9 +462,13 @@ class SceneEditorApp:
         self._create_scrollable_controls() # Creates the main scrollable area for controls.
         self.image_label = ttk.Label(self.image_frame, background='black', anchor=tk.CENTER) # Label to display the image.
         self.image_label.pack(fill=tk.BOTH, expand=True)
+        self.image_label.bind("<Configure>", self._on_display_resize) # Refit the image when the window size changes.
 
         # A status bar at the bottom to give feedback to the user.
-        self.status_var = tk.StringVar(value="Welcome! Load a background or create a new canvas.")
+        welcome = "Welcome! Load a background or create a new canvas."
+        if not PILLOW_SIMD:
+            welcome += " (Tip: install pillow-simd for faster scene generation.)"
+        self.status_var = tk.StringVar(value=welcome)
         ttk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN).pack(side=tk.BOTTOM, fill=tk.X)
 
 
@@ -105,6 +503,13 @@ class SceneEditorApp:
         bg_btn_frame.pack(fill=tk.X)
         ttk.Button(bg_btn_frame, text="Load Background Image", command=self.load_background).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(0,2))
         ttk.Button(bg_btn_frame, text="New Blank Canvas...", command=self.create_new_canvas).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(2,0))
+        # Working Resolution: large backgrounds are shrunk to this size (longest edge) while editing, which makes every
+        # generation much faster. Saving re-creates the scene at the background's full original resolution.
+        res_frame = ttk.Frame(bg_frame)
+        res_frame.pack(fill=tk.X, pady=(5,0))
+        ttk.Label(res_frame, text="Working Resolution (max px):").pack(side=tk.LEFT, padx=(0, 5))
+        self.working_res_var = tk.IntVar(value=2048)
+        ttk.Spinbox(res_frame, from_=256, to=16384, increment=256, textvariable=self.working_res_var, width=8).pack(side=tk.LEFT, expand=True, fill=tk.X)
 
         # 2. Asset Layers Section
         assets_frame = ttk.LabelFrame(parent_frame, text="2. Asset Layers", padding=10)
@@ -231,25 +636,11 @@ class SceneEditorApp:
     def get_check_image(self, checked):
         """Creates or retrieves a small checkmark image for the Treeview."""
         # We cache the images so they are not re-created every time.
-        if not hasattr(self, '_check_images'):
-            self._check_images = {}
         if checked in self._check_images:
             return self._check_images[checked]
 
-        # Create a tiny 16x16 transparent image.
-        im = Image.new("RGBA", (16, 16), (0,0,0,0))
-        draw = ImageDraw.Draw(im)
-        if checked:
-            # Draw a blue box with a white checkmark.
-            draw.rectangle((2,2,12,12), outline="black", fill="dodgerblue")
-            draw.line([(4,8), (7,11), (12,4)], fill="white", width=2)
-        else:
-            # Draw an empty box.
-            draw.rectangle((2,2,12,12), outline="black")
-
-        # Convert the PIL image to a Tkinter-compatible PhotoImage and cache it.
-        photo = ImageTk.PhotoImage(im)
-        ## FIX: The variable name was inconsistent. It must be `_check_images` to match the rest of the method.
+        # Tkinter can decode the embedded PNG data directly, so Pillow isn't needed here at all.
+        photo = tk.PhotoImage(master=self.root, data=_CHECK_PNG_B64 if checked else _UNCHECK_PNG_B64)
         self._check_images[checked] = photo
         return photo
 
@@ -308,13 +699,12 @@ class SceneEditorApp:
         new_val = entry.get()
         # Validate that the input is a positive integer.
         try:
-            if int(new_val) > 0:
-                tree.set(item_id, column_id, int(new_val))
-            else:
-                tree.set(item_id, column_id, 1) # Default to 1 if not positive.
+            count = int(new_val) # Parsed only once.
         except ValueError:
             # If the input is not a number, do nothing and keep the old value.
             pass
+        else:
+            tree.set(item_id, column_id, count if count > 0 else 1) # Default to 1 if not positive.
         entry.destroy() # Remove the temporary entry widget.
 
     # --- 2.4. CORE FUNCTIONALITY METHODS ---
@@ -356,7 +746,10 @@ class SceneEditorApp:
             if W > 0 and H > 0:
                 # Create the new blank PIL Image.
                 self.background_image = Image.new("RGBA", (W, H), color_var.get())
+                self.background_path, self.background_full_size = None, (W, H)
+                self._background_array = np.asarray(self.background_image)
                 # Initialize the generation states.
+                self._last_generation = self._last_title_settings = None
                 self.generated_scene_no_title = self.background_image.copy()
                 self.display_image(self.generated_scene_no_title)
                 self.status_var.set(f"Created new {W}x{H} canvas.")
@@ -369,11 +762,42 @@ class SceneEditorApp:
         """Opens a file dialog to load a background image."""
         path = filedialog.askopenfilename(filetypes=[("Images", "*.png *.jpg *.jpeg")])
         if not path: return
-        self.background_image = Image.open(path).convert("RGBA")
+        image = Image.open(path) # Only reads the file header; the pixels are decoded later.
+        self.background_path, self.background_full_size = path, image.size
+
+        # Shrink very large backgrounds to the working resolution. Everything is generated at this size,
+        # and save_scene re-creates the scene from the original file at full resolution.
+        try:
+            max_size = max(1, self.working_res_var.get())
+        except tk.TclError:
+            max_size = 2048 # The spinbox doesn't contain a valid number.
+        # If this file was opened (and shrunk) before, use the copy saved back then.
+        copy_path = _working_copy_path(path, max_size)
+        try:
+            image = Image.open(copy_path).convert("RGBA")
+            os.utime(copy_path) # Mark it as recently used, so prune_working_copies keeps it.
+        except OSError:
+            # JPEG files can be decoded directly at 1/2, 1/4 or 1/8 size, which is much faster than decoding everything
+            # and shrinking afterwards. draft() picks the smallest of those that is still at least the working size.
+            # (It does nothing for other file types.)
+            ratio = min(max_size / max(image.size), 1.0)
+            image.draft("RGB", (max(1, int(image.width * ratio)), max(1, int(image.height * ratio))))
+            image = image.convert("RGBA")
+            image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS) # Keeps the aspect ratio, never enlarges.
+            if image.size != self.background_full_size:
+                self._save_pool.submit(_save_working_copy, image, copy_path) # Saved in the background for next time.
+        self.background_image = image
+        self._background_array = np.asarray(image) # Converted once here, instead of on every generation.
+
         # Reset the generation states with the new background.
+        self._last_generation = self._last_title_settings = None
         self.generated_scene_no_title = self.background_image.copy()
         self.display_image(self.generated_scene_no_title)
-        self.status_var.set(f"Loaded background: {os.path.basename(path)}")
+        if self.background_image.size != self.background_full_size:
+            W, H = self.background_full_size
+            self.status_var.set(f"Loaded background: {os.path.basename(path)} ({W}x{H}, editing at {self.background_image.width}x{self.background_image.height})")
+        else:
+            self.status_var.set(f"Loaded background: {os.path.basename(path)}")
 
     def load_assets(self, layer_index):
         """Opens a file dialog to load one or more assets into a layer."""
@@ -406,54 +830,34 @@ class SceneEditorApp:
         self.status_var.set("Generating scene... This may take a moment.")
         self.root.update_idletasks() # Force UI update to show the status message.
 
-        # Always start fresh from the original background image.
-        canvas = self.background_image.copy()
-        W, H = canvas.size
+        # --- Deterministic Randomness ---
+        # Draw a fresh seed for every generation and remember it. All random choices come from a private
+        # generator built from this seed (see _compose_scene), so the same seed reproduces the exact same scene.
+        seed = random.randrange(2**63)
+        self.last_seed = seed
 
+        # Read the global scale/rotation settings once, up front. Every .get() is a round trip into Tkinter.
+        # sorted() puts each min/max pair in the right order, in case the sliders were crossed.
+        min_s, max_s = sorted((self.scale_min_var.get(), self.scale_max_var.get()))
+        min_r, max_r = sorted((self.rot_min_var.get(), self.rot_max_var.get()))
+
+        # --- Collect every asset instance to draw ---
         # Process layers in order (0, 1, 2) so they are drawn on top of each other correctly.
+        instances = []  # One (asset path, placement zone) entry per instance, in drawing order.
         for layer_info in self.layers:
             tree = layer_info["tree"]
-            # Get only the assets that are checked in the treeview.
-            checked_item_ids = tree.tag_has('checked')
-
-            for item_id in checked_item_ids:
+            # The per-layer placement setting is the same for every asset in the layer, so read it once.
+            placement_zone = PLACEMENT_ZONES.get(layer_info["placement_var"].get(), PLACEMENT_ZONES["Anywhere"])
+            # Get only the assets that are checked in the treeview, each with its instance count, in one pass.
+            for item_id, count in self._read_checked_counts(tree):
                 asset_path = layer_info["assets"][item_id]["path"]
-                try:
-                    # Get the instance count from the treeview.
-                    count = int(tree.item(item_id, 'values')[1])
-                except (ValueError, IndexError):
-                    count = 1 # Default to 1 if invalid.
-
-                # For each instance of the asset...
-                for _ in range(count):
-                    try:
-                        asset_img = Image.open(asset_path).convert("RGBA")
-
-                        # --- Apply Transformations ---
-                        # Scale
-                        min_s, max_s = min(self.scale_min_var.get(), self.scale_max_var.get()), max(self.scale_min_var.get(), self.scale_max_var.get())
-                        scale = random.uniform(min_s / 100.0, max_s / 100.0)
-                        new_size = (int(asset_img.width * scale), int(asset_img.height * scale))
-                        asset_img = asset_img.resize(new_size, Image.Resampling.LANCZOS)
-
-                        # Rotation
-                        min_r, max_r = min(self.rot_min_var.get(), self.rot_max_var.get()), max(self.rot_min_var.get(), self.rot_max_var.get())
-                        angle = random.uniform(min_r, max_r)
-                        asset_img = asset_img.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
-
-                        # --- Placement ---
-                        w, h = asset_img.size
-                        placement_zone = layer_info["placement_var"].get() # Use the per-layer setting.
-                        x_range, y_range = self.get_placement_zone(W, H, w, h, placement_zone)
-
-                        # Ensure the placement range is valid before trying to pick a random spot.
-                        if x_range[1] < x_range[0] or y_range[1] < y_range[0]: continue
-                        pos = (random.randint(*x_range), random.randint(*y_range))
-
-                        # Paste the transformed asset onto the canvas, using its alpha channel as a mask.
-                        canvas.paste(asset_img, pos, asset_img)
-                    except Exception as e:
-                        print(f"Error processing asset instance {asset_path}: {e}")
+                instances.extend([(asset_path, placement_zone)] * count)
+
+        # Remember everything the scene is made from. Together with the seed, this re-creates the exact same
+        # scene later at any resolution (save_scene uses it to render at the background's full resolution).
+        self._last_generation = {"seed": seed, "instances": instances,
+                                 "scale_range": (min_s / 100.0, max_s / 100.0), "rotation_range": (min_r, max_r)}
+        canvas = Image.fromarray(self._compose_scene(self._background_array, self._last_generation))
 
         # --- Finalize and Display ---
         # Save the result of the asset generation.
@@ -462,35 +866,124 @@ class SceneEditorApp:
         final_image = self._render_title_on_image(self.generated_scene_no_title)
         # Display the final image.
         self.display_image(final_image)
-        self.status_var.set("Scene generation complete!")
-
-    def get_placement_zone(self, W, H, w, h, zone):
-        """Calculates the valid (x, y) coordinate ranges based on a placement zone string."""
-        # Start with the full canvas area, adjusted for the asset's size.
-        x_range, y_range = (0, max(0, W - w)), (0, max(0, H - h))
-        # Narrow the range based on the selected zone.
-        if zone == "Top Half": y_range = (0, max(0, H//2 - h))
-        elif zone == "Bottom Half": y_range = (H//2, max(H//2, H - h))
-        elif zone == "Left Half": x_range = (0, max(0, W//2 - w))
-        elif zone == "Right Half": x_range = (W//2, max(W//2, W - w))
-        return x_range, y_range
-
-    def _render_title_on_image(self, base_image):
-        """Takes a PIL image and draws the current title on it. Returns a new image."""
+        self.status_var.set(f"Scene generation complete! (Seed: {seed})")
+
+    def _read_checked_counts(self, tree):
+        """
+        Returns a list of (item ID, instance count) for every checked asset in 'tree'.
+        Only the "count" cell is read for each item (one Tkinter call each), instead of all of its values.
+        """
+        checked = []
+        for item_id in tree.tag_has('checked'):
+            try:
+                count = int(tree.set(item_id, "count"))
+            except ValueError:
+                count = 1 # Default to 1 if invalid.
+            checked.append((item_id, count))
+        return checked
+
+    def _compose_scene(self, background, generation, factor=1.0):
+        """
+        Draws the asset instances described by 'generation' (see generate_scene) onto a copy of 'background',
+        an RGBA NumPy array of shape (H, W, 4).
+        'factor' is how much larger 'background' is than the working-resolution background the scene was generated on;
+        asset sizes are multiplied by it and positions follow the canvas size, so the result matches the on-screen scene.
+        Returns the new RGBA array. Doesn't touch any Tkinter widgets or variables.
+        """
+        # Always start fresh from the original background: a new uninitialized buffer, then one straight memory copy.
+        # Each scene gets its own buffer, because the returned image keeps using it (Image.fromarray doesn't copy).
+        canvas = np.empty_like(background)
+        np.copyto(canvas, background)
+        H, W = canvas.shape[:2]
+        # Color and alpha views of the canvas, for the blending code (the canvas itself stays one RGBA array).
+        canvas_rgb, canvas_a = canvas[..., :3], canvas[..., 3]
+        instances = generation["instances"]
+
+        # Load each asset file once, however many instances use it.
+        sources = {} # asset path -> loaded PIL image (or None if it couldn't be loaded).
+        for asset_path, _ in instances:
+            if asset_path not in sources:
+                try:
+                    sources[asset_path] = Image.open(asset_path).convert("RGBA")
+                except Exception as e:
+                    print(f"Error loading asset {asset_path}: {e}")
+                    sources[asset_path] = None
+        instances = [(path, zone) for path, zone in instances if sources[path] is not None]
+
+        # --- Plan the size, rotation and position of all instances at once ---
+        # The random numbers come from the generation's seed, so the same seed always gives the same plan.
+        n = len(instances)
+        rng = np.random.default_rng(generation["seed"])
+        src_w = np.array([sources[path].width for path, _ in instances], dtype=np.int64)
+        src_h = np.array([sources[path].height for path, _ in instances], dtype=np.int64)
+        zones = np.array([zone for _, zone in instances], dtype=np.float64).reshape(n, 4)
+        min_s, max_s = generation["scale_range"]
+        min_r, max_r = generation["rotation_range"]
+        plan, angles = _plan_instances(rng.random((n, 4)), src_w, src_h, zones, W, H,
+                                       min_s * factor, max_s * factor, min_r, max_r)
+
+        # --- Transform each instance (in parallel), then draw them in order ---
+        # Scaling and rotating are independent for every instance, so they are spread over all CPU cores.
+        # Drawing has to happen one at a time, in the original order, so the layers still stack correctly.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            jobs = [] # (asset path, x, y, future) in drawing order.
+            for (asset_path, _), (w, h, rw, rh, x, y, ok), angle in zip(instances, plan.tolist(), angles.tolist()):
+                if not ok: continue # Scaled down to nothing.
+                jobs.append((asset_path, x, y, pool.submit(_transform_asset, sources[asset_path], w, h, angle)))
+
+            for i, (asset_path, x, y, job) in enumerate(jobs):
+                jobs[i] = None # Let the transformed asset be freed as soon as it has been drawn.
+                try:
+                    # Blend the transformed asset onto the canvas. Only the asset's own area is touched.
+                    asset_rgb, asset_a = job.result()
+                    _blit(canvas_rgb, canvas_a, asset_rgb, asset_a, x, y)
+                except Exception as e:
+                    print(f"Error processing asset instance {asset_path}: {e}")
+        return canvas
+
+    def _render_full_resolution(self):
+        """
+        Re-creates the current scene from the original background file at its full resolution.
+        Returns None when the background wasn't shrunk (so the on-screen image already is full resolution).
+        """
+        if not self.background_path or self.background_image.size == self.background_full_size:
+            return None
+        background = Image.open(self.background_path).convert("RGBA")
+        factor = background.width / self.background_image.width
+        if self._last_generation:
+            background = Image.fromarray(self._compose_scene(np.asarray(background), self._last_generation, factor))
+        scene = background
+        # Re-apply the title that is currently on screen, scaled up to match.
+        if self._last_title_settings:
+            scene = self._render_title_on_image(scene, self._last_title_settings, factor)
+        return scene
+
+    def _render_title_on_image(self, base_image, settings=None, scale=1.0):
+        """
+        Takes a PIL image and draws a title on it. Returns a new image.
+        By default the current title settings are used (and remembered as the on-screen title's settings);
+        'settings' can instead pass a stored copy, and 'scale' enlarges the title for higher-resolution output.
+        """
+        if settings is None:
+            settings = {"text": self.title_text_var.get(), "font": self.title_font_var.get(), "size": self.title_size_var.get(),
+                        "position": self.title_pos_var.get(), "color": self.title_color_var.get(),
+                        "shadow": self.shadow_enabled_var.get(), "shadow_color": self.shadow_color_var.get()}
+            self._last_title_settings = settings
+
         # If there's no title text, just return the base image.
-        if not self.title_text_var.get().strip():
+        if not settings["text"].strip():
             return base_image
 
         image_with_title = base_image.copy()
         draw = ImageDraw.Draw(image_with_title)
-        text = self.title_text_var.get()
-        font_name = self.title_font_var.get()
-        font_size = self.title_size_var.get()
+        text = settings["text"]
+        font_name = settings["font"]
+        font_size = max(1, int(settings["size"] * scale))
+        margin = int(10 * scale) # Distance from the image edges.
 
-        # Load the font file.
+        # Load the font file (or reuse it if it was loaded before).
         try:
-            font_path = fm.findfont(fm.FontProperties(family=font_name))
-            font = ImageFont.truetype(font_path, font_size)
+            font = self._get_font(font_name, font_size)
         except Exception as e:
             print(f"Font error: {e}. Falling back to default.")
             font = ImageFont.load_default()
@@ -501,21 +994,52 @@ class SceneEditorApp:
         text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
 
         pos_map = {
-            "Center": ((W-text_w)//2, (H-text_h)//2), "Top Center": ((W-text_w)//2, 10),
-            "Bottom Center": ((W-text_w)//2, H-text_h-10), "Top Left": (10, 10),
-            "Bottom Right": (W-text_w-10, H-text_h-10)
+            "Center": ((W-text_w)//2, (H-text_h)//2), "Top Center": ((W-text_w)//2, margin),
+            "Bottom Center": ((W-text_w)//2, H-text_h-margin), "Top Left": (margin, margin),
+            "Bottom Right": (W-text_w-margin, H-text_h-margin)
         }
-        x, y = pos_map.get(self.title_pos_var.get(), (10,10))
-
-        # Draw shadow first, if enabled.
-        if self.shadow_enabled_var.get():
-            shadow_offset = int(font_size * 0.05) + 2 # Dynamic shadow offset based on font size
-            draw.text((x + shadow_offset, y + shadow_offset), text, font=font, fill=self.shadow_color_var.get())
+        x, y = pos_map.get(settings["position"], (margin, margin))
+
+        # Rasterize the text only once, into a grayscale mask (white = text), with some room around it for the shadow's blur.
+        # Both the shadow and the text are then filled in through this same mask.
+        shadow_offset = int(font_size * 0.05) + 2 # Dynamic shadow offset based on font size
+        blur_radius = shadow_offset / 2
+        pad = int(blur_radius * 3) + 1
+        mask = Image.new("L", (text_w + 2 * pad, text_h + 2 * pad), 0)
+        ImageDraw.Draw(mask).text((pad - bbox[0], pad - bbox[1]), text, font=font, fill=255)
+        mask_x, mask_y = x + bbox[0] - pad, y + bbox[1] - pad # Where the mask must go so the text lands at (x, y).
+
+        # Draw shadow first, if enabled: the same mask, softened with a blur and shifted down-right.
+        if settings["shadow"]:
+            shadow_mask = mask.filter(ImageFilter.GaussianBlur(blur_radius))
+            image_with_title.paste(settings["shadow_color"], (mask_x + shadow_offset, mask_y + shadow_offset), shadow_mask)
 
         # Draw the main text on top of the shadow.
-        draw.text((x,y), text, font=font, fill=self.title_color_var.get())
+        image_with_title.paste(settings["color"], (mask_x, mask_y), mask)
         return image_with_title
 
+    def _get_font(self, font_name, font_size):
+        """Returns a loaded TrueType font, reusing a cached one when the same name and size were loaded before."""
+        key = (font_name, font_size)
+        font = self._font_cache.get(key)
+        if font is not None:
+            self._font_cache.move_to_end(key) # Mark as most recently used.
+            return font
+
+        # Resolve the font name to a file path once per name.
+        font_path = self._font_path_cache.get(font_name)
+        if font_path is None:
+            import matplotlib.font_manager as fm # Only needed for fonts that weren't found by the startup scan.
+            font_path = fm.findfont(fm.FontProperties(family=font_name))
+            self._font_path_cache[font_name] = font_path
+
+        font = ImageFont.truetype(font_path, font_size)
+        self._font_cache[key] = font
+        # Drop the least recently used font if the cache has grown too large.
+        if len(self._font_cache) > FONT_CACHE_SIZE:
+            self._font_cache.popitem(last=False)
+        return font
+
     def add_title(self):
         """Applies or updates the title on the most recently generated scene."""
         if not self.generated_scene_no_title:
@@ -540,38 +1064,138 @@ class SceneEditorApp:
         if not filepath: return
 
         # The image to save is the one currently on screen, which includes the title.
-        image_to_save = self.current_scene_image
+        # If the background was shrunk to the working resolution, the scene is re-created at full resolution instead.
+        self.status_var.set("Saving...")
+        self.root.update_idletasks()
+        # Saving the same scene again (e.g. as both PNG and JPG) reuses the work done for the previous save.
+        scene = self.current_scene_image
+        if self._save_cache is None or self._save_cache[0] is not scene:
+            full_image = self._render_full_resolution() or scene
+            self._save_cache = (scene, full_image, None, np.asarray(full_image)[..., 3].min() == 255)
+        _, full_image, rgb_image, opaque = self._save_cache
+        is_jpg = filepath.lower().endswith(('.jpg', '.jpeg'))
+
+        # JPG has no transparency, so the image is flattened onto white (only once per scene) to avoid errors.
+        # A PNG of a fully opaque scene (the usual case) is saved as RGB too: its alpha channel would be all 255 anyway,
+        # and leaving it out makes the file smaller and faster to write.
+        if is_jpg or opaque:
+            if rgb_image is None:
+                rgb_image = _flatten_on_white(full_image)
+                self._save_cache = (scene, full_image, rgb_image, opaque)
+            image_to_save = rgb_image
+        else:
+            image_to_save = full_image
 
-        # If saving as JPG, convert from RGBA to RGB to avoid errors.
-        if filepath.lower().endswith(('.jpg', '.jpeg')):
-            image_to_save = image_to_save.convert('RGB')
+        # The save settings are given explicitly, so files don't depend on the installed Pillow version's defaults.
+        if is_jpg:
+            options = {"format": "JPEG", "quality": 90, "subsampling": 2, "optimize": False, "progressive": False}
+        else:
+            options = {"format": "PNG", "compress_level": 6} # Level 6 compresses almost as well as the maximum (9) in a fraction of the time.
 
-        image_to_save.save(filepath)
-        self.status_var.set(f"Scene saved to {filepath}")
+        # Encoding and writing the file happens on a background thread, so the window stays responsive meanwhile.
+        job = self._save_pool.submit(image_to_save.save, filepath, **options)
+        self._check_save_done(job, filepath)
+
+    def _check_save_done(self, job, filepath):
+        """
+        Checks every 100 ms whether a background save has finished, then reports the result.
+        (Tkinter widgets may only be touched from the main thread, so the save thread can't do this itself.)
+        """
+        if not job.done():
+            self.root.after(100, self._check_save_done, job, filepath)
+            return
+        error = job.exception()
+        if error:
+            messagebox.showerror("Save Error", f"Could not save {filepath}:\n{error}")
+            self.status_var.set("Saving failed.")
+        else:
+            self.status_var.set(f"Scene saved to {filepath}")
+
+    def _on_display_resize(self, event):
+        """
+        Redraws the image to fit the new window size. Dragging the window edge sends a burst of these events,
+        so the redraw waits until no resize has happened for 80 ms, and then runs only once.
+        """
+        self._label_size = (event.width, event.height)
+        if self._resize_job:
+            self.root.after_cancel(self._resize_job)
+        self._resize_job = self.root.after(80, self._flush_display)
+
+    def _flush_display(self):
+        """Runs the redraw scheduled by _on_display_resize."""
+        self._resize_job = None
+        if self.current_scene_image:
+            self.display_image(self.current_scene_image)
 
     def display_image(self, pil_image):
         """Updates the image label to show a new PIL image."""
+        # Drawing now makes any redraw still waiting from a window resize unnecessary.
+        if self._resize_job:
+            self.root.after_cancel(self._resize_job)
+            self._resize_job = None
+        # A different image than the one on screen makes all the saved thumbnails out of date.
+        # (This also makes id() safe to use below: every cached thumbnail belongs to the image kept alive just here.)
+        if pil_image is not self.current_scene_image:
+            self._thumb_cache.clear()
+            self._shown_thumb_key = None
         # Store a reference to the full-resolution PIL image.
         self.current_scene_image = pil_image
 
-        # Get the size of the display area to create a properly-sized thumbnail.
-        display_w = self.image_label.winfo_width()
-        display_h = self.image_label.winfo_height()
+        # Get the size of the display area to create a properly-sized thumbnail (kept up to date by _on_display_resize).
+        display_w, display_h = self._label_size
         # Fallback size if the window isn't drawn yet.
         if display_w <= 1 or display_h <= 1:
             display_w, display_h = 800, 600
 
-        # Create a copy and resize it to fit the display label without modifying the original.
-        img_copy = pil_image.copy()
-        img_copy.thumbnail((display_w - 10, display_h - 10), Image.Resampling.LANCZOS)
+        # Any preview still being made in the background is for an older request now, so it won't be shown.
+        self._display_seq += 1
 
-        # Convert to a Tkinter-compatible image and update the label.
-        self.tk_image = ImageTk.PhotoImage(img_copy)
-        self.image_label.config(image=self.tk_image)
+        # The same image at the same size was shown before: reuse its thumbnail instead of resizing again.
+        key = (id(pil_image), display_w, display_h)
+        if key == self._shown_thumb_key:
+            return # Exactly this thumbnail is already on screen.
+        if key in self._thumb_cache:
+            self._thumb_cache.move_to_end(key) # Mark as most recently used.
+            self._show_thumbnail(key, self._thumb_cache[key])
+            return
+
+        # Otherwise shrink the image on a background thread, so the window keeps responding meanwhile.
+        job = self._display_pool.submit(_fit_image, pil_image, max(1, display_w - 10), max(1, display_h - 10))
+        self._check_display_done(job, self._display_seq, key)
+
+    def _check_display_done(self, job, seq, key):
+        """
+        Checks every 10 ms whether a preview started by display_image is ready, then shows it.
+        (Tkinter images may only be created on the main thread, so this can't be done by the worker thread.)
+        """
+        if seq != self._display_seq:
+            return # A newer image or size was requested since; this preview is out of date.
+        if not job.done():
+            self.root.after(10, self._check_display_done, job, seq, key)
+            return
+        small = job.result()
+        self._thumb_cache[key] = small
+        if len(self._thumb_cache) > THUMB_CACHE_SIZE:
+            self._thumb_cache.popitem(last=False) # Forget the least recently used thumbnail.
+        self._show_thumbnail(key, small)
+
+    def _show_thumbnail(self, key, small):
+        """Puts the preview image 'small' (the thumbnail cached under 'key') on screen."""
+        self._shown_thumb_key = key
+        # If the on-screen image already has this size, just copy the new pixels into it.
+        # That is much cheaper than creating a new Tkinter image and re-configuring the label.
+        if self.tk_image is not None and (self.tk_image.width(), self.tk_image.height()) == small.size:
+            self.tk_image.paste(small)
+        else:
+            # Convert to a Tkinter-compatible image and update the label.
+            self.tk_image = ImageTk.PhotoImage(small)
+            self.image_label.config(image=self.tk_image)
 
 # === 3. APPLICATION LAUNCHER ===
 # This standard Python construct ensures the code inside only runs when the script is executed directly.
 if __name__ == "__main__":
+    if not PILLOW_SIMD: # A one-line hint on the console too, next to the one in the status bar.
+        print(f"Pillow {PIL.__version__} found. For faster resizing, install Pillow-SIMD: pip uninstall pillow && pip install pillow-simd")
     root = tk.Tk()      # Create the main window.
     app = SceneEditorApp(root) # Create an instance of our application class.
     root.mainloop()     # Start the Tkinter event loop to run the application.
\ No newline at end of file
@@ -4,10 +4,178 @@ from tkinter import ttk, filedialog, messagebox, colorchooser
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import os
 import random
+import math # For the rotated-size bound in _paste_asset
+import hashlib # For naming the decoded copies in the on-disk asset cache
+import functools # For caching loaded title fonts
 import uuid  # For giving each placed asset a unique ID
+from concurrent.futures import ThreadPoolExecutor # Decodes dropped/selected assets in the background
+from collections import OrderedDict, defaultdict # For the least-recently-used cache of transformed assets and the hit-test grid
+import numpy as np # Fast pixel arrays, used to composite the scene
 import matplotlib.font_manager as fm
 from tkinterdnd2 import DND_FILES, TkinterDnD # For Drag-and-Drop functionality
 
+# Numba (optional) compiles the compositing loop to fast, multi-threaded machine code.
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit when Numba isn't installed: leaves the function as normal Python."""
+        return lambda func: func
+
+# How many scaled/rotated asset images to keep, so unchanged assets don't have to be re-transformed on every redraw
+TRANSFORM_CACHE_SIZE = 512
+# Decoded assets are also kept on disk, so they don't have to be decoded again the next time the app starts
+ASSET_DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "scene_editor", "assets")
+ASSET_DISK_CACHE_MAX_BYTES = 500 * 1024 * 1024 # The least recently used copies are deleted beyond this
+# Pre-shrunk copies of each asset (1/2, 1/4, 1/8 size), so small scales are resized from a nearby size, see _build_mipmaps
+MIPMAP_LEVELS = 3
+# Size (in full-resolution pixels) of the square cells used to find the assets under a mouse click, see _set_bbox
+HIT_GRID_CELL = 128
+
+@njit(parallel=True, cache=True)
+def _composite_over_kernel(dst, src, x, y):
+    """Numba version of _composite_over_numpy (same arguments, same result). The rows are spread over all CPU cores."""
+    h, w = src.shape[0], src.shape[1]
+    H, W = dst.shape[0], dst.shape[1]
+    x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, W), min(y + h, H)
+    for j in prange(y0, y1):
+        for i in range(x0, x1):
+            a = np.int32(src[j - y, i - x, 3])
+            if a == 0: continue # Fully transparent: nothing changes
+            if a == 255: # Fully opaque: the asset simply covers the canvas
+                for c in range(4):
+                    dst[j, i, c] = src[j - y, i - x, c]
+                continue
+            for c in range(4):
+                dst[j, i, c] = min(255, src[j - y, i - x, c] + (np.int32(dst[j, i, c]) * (255 - a) + 127) // 255)
+
+def _composite_over_numpy(dst, src, x, y):
+    """
+    Draws the RGBA array 'src' over the RGBA array 'dst' (both uint8, shape (h, w, 4)) with its top-left corner
+    at (x, y), using the standard "over" rule. Parts of 'src' outside 'dst' are ignored. 'dst' is changed in place.
+    Both arrays hold premultiplied alpha (colors already multiplied by their alpha, Pillow's "RGBa" mode),
+    so every channel is simply: result = asset + canvas * (1 - asset alpha).
+    """
+    h, w = src.shape[:2]
+    H, W = dst.shape[:2]
+    x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, W), min(y + h, H) # Clip to the canvas
+    if x0 >= x1 or y0 >= y1: return
+    s = src[y0 - y:y1 - y, x0 - x:x1 - x]
+    d = dst[y0:y1, x0:x1]
+    keep = 255 - s[..., 3:4].astype(np.uint16) # How much of the canvas shows through, kept as a (h, w, 1) column
+    # (Capped at 255: bicubic rotation can leave a color slightly above its alpha.)
+    d[...] = np.minimum(s + (d * keep + 127) // 255, 255)
+
+# Use the compiled loop when Numba is installed; otherwise the NumPy version is much faster than plain Python loops
+composite_over = _composite_over_kernel if NUMBA_AVAILABLE else _composite_over_numpy
+
+def _scale_rotate(image, new_size, angle, resample):
+    """
+    Same as image.resize(new_size).rotate(angle, expand=True), but done as one affine transform, so the pixels
+    are only resampled once. (Only used where 'resample' doesn't need to smooth a downscale, see _get_transformed.)
+    """
+    # Pillow's rotate(expand=True) matrix for an image of size new_size (output pixel -> rotated-from pixel)...
+    w, h = new_size
+    a = -math.radians(angle % 360.0)
+    cos_a, sin_a = round(math.cos(a), 15), round(math.sin(a), 15)
+    xs = [cos_a * (x - w / 2) + sin_a * (y - h / 2) + w / 2 for x, y in ((0, 0), (w, 0), (w, h), (0, h))]
+    ys = [-sin_a * (x - w / 2) + cos_a * (y - h / 2) + h / 2 for x, y in ((0, 0), (w, 0), (w, h), (0, h))]
+    out_w, out_h = math.ceil(max(xs)) - math.floor(min(xs)), math.ceil(max(ys)) - math.floor(min(ys))
+    cx, cy = -(out_w - w) / 2.0 - w / 2, -(out_h - h) / 2.0 - h / 2
+    c = cos_a * cx + sin_a * cy + w / 2
+    f = -sin_a * cx + cos_a * cy + h / 2
+    # ...followed by the resize, folded in by stretching each row of the matrix back to the original size
+    kx, ky = image.width / w, image.height / h
+    matrix = (cos_a * kx, sin_a * kx, c * kx, -sin_a * ky, cos_a * ky, f * ky)
+    return image.transform((out_w, out_h), Image.Transform.AFFINE, matrix, resample=resample)
+
+def _asset_disk_cache_path(path):
+    """
+    Returns where the decoded copy of the asset file 'path' is kept (see _decode_asset).
+    The name is a fingerprint of the file's location, modification time and size, so an edited file gets a new copy.
+    """
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+    return os.path.join(ASSET_DISK_CACHE_DIR, hashlib.blake2b(key.encode("utf-8", errors="replace"), digest_size=20).hexdigest() + ".npy")
+
+def _decode_asset(path):
+    """
+    Reads one asset file. Runs on a worker thread (Pillow lets other threads run while it decodes).
+    The decoded pixels are saved as a raw .npy file, which later launches read back much faster than decoding the PNG.
+    """
+    copy_path = _asset_disk_cache_path(path)
+    try:
+        pixels = np.load(copy_path)
+        os.utime(copy_path) # Mark it as recently used, so prune_asset_disk_cache keeps it
+        return Image.frombuffer("RGBa", (pixels.shape[1], pixels.shape[0]), pixels, "raw", "RGBa", 0, 1)
+    except (OSError, ValueError):
+        pass # Not cached yet (or unreadable): decode the file
+    # Stored premultiplied ("RGBa"), which is what resizing, rotating and compositing work with.
+    # Most PNG assets already are RGBA, and then the extra full-size copy from convert("RGBA") is skipped.
+    image = Image.open(path)
+    image.load()
+    if image.mode != "RGBA": image = image.convert("RGBA")
+    image = image.convert("RGBa")
+    try:
+        os.makedirs(ASSET_DISK_CACHE_DIR, exist_ok=True)
+        # Written to a temporary file first and then swapped in, so a crash can't leave a half-written file
+        tmp_path = f"{copy_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.asarray(image))
+        os.replace(tmp_path, copy_path)
+    except OSError as e:
+        print(f"Could not save the decoded copy of {path}: {e}")
+    return image
+
+def _build_mipmaps(image):
+    """Returns [image, image at 1/2 size, 1/4, 1/8] (fewer when it gets too small). Runs on a worker thread."""
+    levels = [image]
+    for _ in range(MIPMAP_LEVELS):
+        prev = levels[-1]
+        if prev.width < 2 or prev.height < 2: break
+        levels.append(prev.resize((prev.width // 2, prev.height // 2), Image.Resampling.LANCZOS))
+    return levels
+
+def _load_asset(path):
+    """Decodes an asset and builds its mipmaps (see _decode_asset and _build_mipmaps). Runs on a worker thread."""
+    return _build_mipmaps(_decode_asset(path))
+
+@functools.lru_cache(maxsize=64)
+def _resolve_font_path(font_name):
+    """Finds the font file for a font family name (matplotlib searches its font list, so the answer is remembered)."""
+    return fm.findfont(fm.FontProperties(family=font_name))
+
+@functools.lru_cache(maxsize=64)
+def _get_font(font_name, font_size):
+    """Returns the loaded font for (name, size). Loading parses the whole font file, so fonts are reused between redraws."""
+    try:
+        return ImageFont.truetype(_resolve_font_path(font_name), font_size)
+    except Exception: return ImageFont.load_default()
+
+def _scan_system_fonts():
+    """Returns the sorted names of all installed TrueType fonts. Slow with many fonts; runs on a worker thread."""
+    font_paths = fm.findSystemFonts(fontpaths=None, fontext='ttf')
+    return sorted({fm.FontProperties(fname=font_path).get_name() for font_path in font_paths})
+
+def prune_asset_disk_cache():
+    """Deletes the least recently used decoded asset copies until the cache is under ASSET_DISK_CACHE_MAX_BYTES."""
+    try:
+        entries = [(entry.path, entry.stat()) for entry in os.scandir(ASSET_DISK_CACHE_DIR) if entry.name.endswith(".npy")]
+    except OSError:
+        return # Nothing cached yet
+    entries.sort(key=lambda e: e[1].st_mtime, reverse=True) # Most recently used first
+    total = 0
+    for copy_path, st in entries:
+        total += st.st_size
+        if total > ASSET_DISK_CACHE_MAX_BYTES:
+            try:
+                os.remove(copy_path)
+            except OSError:
+                pass # In use or already gone; it will be tried again next time
+
 # === 2. MAIN APPLICATION CLASS ===
 class SceneEditorApp:
     # --- 2.1. INITIALIZATION ---
@@ -27,9 +195,29 @@ class SceneEditorApp:
         self.tk_image = None
         
         self.asset_cache = {}  # Caches loaded PIL Images to avoid re-reading from disk
-        self.placed_assets = []  # The new "source of truth". A list of all asset objects on the canvas.
+        self._mip_cache = {} # path -> [asset, 1/2 size, 1/4, 1/8], see _build_mipmaps
+        self._transform_cache = OrderedDict() # (path, scale, rotation, draft) -> scaled and rotated RGBA array, see _get_transformed
+        self.placed_assets = []  # The new "source of truth". A list of all asset objects on the canvas, always kept in draw (layer) order.
+        self._asset_index = {} # 'id' -> asset object, kept in step with placed_assets for O(1) lookups
+        self._hit_grid = defaultdict(set) # (column, row) of a HIT_GRID_CELL cell -> ids of the assets whose bbox touches it
+        self._asset_cells = {} # 'id' -> the cells that asset is currently listed under in _hit_grid
         self.selected_asset_id = None # Tracks the 'id' of the currently selected asset object.
         self._drag_data = {"x": 0, "y": 0, "item_id": None, "mode": None} # For mouse drag state
+        self._pending_drag = None # Latest mouse position (image coords) not yet applied, see on_canvas_drag
+        self._drag_redraw_scheduled = False # True while a _flush_drag call is waiting for the event loop to go idle
+        self._static_composite = None # Background + every asset except the dragged one, reused on each drag frame
+        self._static_excluded_id = None # The 'id' of the asset left out of _static_composite
+        self._dirty_static = True # True when _static_composite is out of date and must be rebuilt
+        self._static_factor = 1 # The proxy factor _static_composite was drawn at
+        self._drag_frame = None # The last drag frame: _static_composite with the dragged asset pasted on top
+        self._drag_dirty = None # (x1, y1, x2, y2) of _drag_frame the dragged asset was pasted over, in its pixels
+        self._thumb_geometry = None # ((scene w, h, canvas w, h), on-screen size), see display_image
+        self._canvas_img_id = None # The canvas item that shows tk_image
+        self._selection_ids = None # (outline, resize handle) canvas items drawn over the selected asset, see _update_selection_overlay
+        self._loader = ThreadPoolExecutor(max_workers=os.cpu_count()) # Decodes assets off the Tk thread, see load_assets
+        self._loading_paths = set() # Assets submitted to _loader that haven't been added yet (prevents duplicates)
+        self._loader.submit(prune_asset_disk_cache) # Tidy up the on-disk asset cache (see _decode_asset) in the background
+        self._background_arrays = {} # Shrink factor -> the background as a premultiplied RGBA array (factor 2 and 4 are used while dragging)
 
         # --- Display Coordinate Mapping ---
         # These are crucial for converting mouse clicks on the displayed thumbnail
@@ -37,13 +225,10 @@ class SceneEditorApp:
         self._display_info = {"thumb_w": 1, "thumb_h": 1, "offset_x": 0, "offset_y": 0, "scale_factor": 1.0}
 
         # --- Font Loading ---
-        try:
-            font_paths = fm.findSystemFonts(fontpaths=None, fontext='ttf')
-            unique_font_names = {fm.FontProperties(fname=font_path).get_name() for font_path in font_paths}
-            self.system_fonts = sorted(list(unique_font_names))
-        except Exception as e:
-            print(f"Font loading failed: {e}")
-            self.system_fonts = ["Arial", "Courier New", "Times New Roman"]
+        # Scanning every installed font can take seconds, so it only happens (in the background) the first time
+        # the font list is opened, see _load_system_fonts. Until then, these are offered.
+        self.system_fonts = ["Arial", "Courier New", "Times New Roman"]
+        self._font_scan = None # The background font scan, once started
 
         # --- Layer Data ---
         self.layers = [
@@ -174,7 +359,8 @@ class SceneEditorApp:
         ttk.Label(parent, text="Title Text:").grid(row=0, column=0, sticky="w")
         ttk.Entry(parent, textvariable=self.title_text_var).grid(row=0, column=1, columnspan=2, sticky="ew")
         ttk.Label(parent, text="Font:").grid(row=1, column=0, sticky="w")
-        ttk.Combobox(parent, textvariable=self.title_font_var, values=self.system_fonts, state='readonly').grid(row=1, column=1, columnspan=2, sticky="ew")
+        self.font_combobox = ttk.Combobox(parent, textvariable=self.title_font_var, values=self.system_fonts, state='readonly', postcommand=self._load_system_fonts)
+        self.font_combobox.grid(row=1, column=1, columnspan=2, sticky="ew")
         ttk.Label(parent, text="Size:").grid(row=2, column=0, sticky="w")
         ttk.Spinbox(parent, from_=10, to=500, textvariable=self.title_size_var).grid(row=2, column=1, columnspan=2, sticky="ew")
         ttk.Label(parent, text="Position:").grid(row=3, column=0, sticky="w")
@@ -185,6 +371,24 @@ class SceneEditorApp:
         ttk.Button(parent, text="Shadow Color...", command=lambda: self.choose_color(self.shadow_color_var)).grid(row=5, column=1, sticky="ew")
         ttk.Button(parent, text="Add/Update Title", command=self.add_title).grid(row=6, column=0, columnspan=2, sticky="ew", pady=5)
 
+    def _load_system_fonts(self):
+        """Starts the installed-font scan the first time the font list is opened; the list is filled in when it's done."""
+        if self._font_scan is not None: return
+        self._font_scan = self._loader.submit(_scan_system_fonts)
+        self._check_fonts_done()
+
+    def _check_fonts_done(self):
+        """Puts the scanned font names into the font list, or checks again shortly if the scan is still running."""
+        if not self._font_scan.done():
+            self.root.after(100, self._check_fonts_done)
+            return
+        try:
+            self.system_fonts = self._font_scan.result()
+        except Exception as e:
+            print(f"Font loading failed: {e}")
+            return # Keep the default list
+        self.font_combobox.configure(values=self.system_fonts)
+
     def get_check_image(self, checked): # Unchanged
         if not hasattr(self, '_check_images'): self._check_images = {}
         if checked in self._check_images: return self._check_images[checked]
@@ -216,21 +420,39 @@ class SceneEditorApp:
             paths = filedialog.askopenfilenames(title=f"Select assets for {self.layers[layer_index]['name']}", filetypes=[("PNG Images", "*.png")])
         if not paths: return
 
+        # Decoding happens on the _loader threads so a big drop doesn't freeze the window;
+        # _check_loads_done then adds the results to the layer from the Tk thread.
+        # Paths are made canonical first, so the same file reached through a different path or link isn't loaded twice
+        paths = [os.path.realpath(p) for p in paths]
+        new_paths = [p for p in dict.fromkeys(paths) if p not in self.asset_cache and p not in self._loading_paths] # Prevent duplicates
+        if not new_paths: return
+        self._loading_paths.update(new_paths)
+        jobs = [(path, self._loader.submit(_load_asset, path)) for path in new_paths]
+        self.status_var.set(f"Loading {len(jobs)} assets into Layer {layer_index+1}...")
+        self._check_loads_done(layer_index, jobs, len(jobs), 0)
+
+    def _check_loads_done(self, layer_index, jobs, total, added):
+        """Adds finished assets to the layer in the order they were picked, and checks again shortly until all are done."""
         layer = self.layers[layer_index]
-        new_assets_count = 0
-        for path in paths:
-            if path not in self.asset_cache: # Prevent duplicates
-                try:
-                    # Cache the asset image to prevent re-reading from disk
-                    self.asset_cache[path] = Image.open(path).convert("RGBA")
-                    asset_name = os.path.basename(path)
-                    item_id = layer["tree"].insert("", "end", values=(asset_name, 1), tags=('unchecked',))
-                    layer["assets"][item_id] = {"path": path, "name": asset_name}
-                    new_assets_count += 1
-                except Exception as e:
-                    print(f"Failed to load or cache asset {path}: {e}")
-        if new_assets_count > 0:
-            self.status_var.set(f"Added {new_assets_count} new assets to Layer {layer_index+1}.")
+        while jobs and jobs[0][1].done():
+            path, job = jobs.pop(0)
+            self._loading_paths.discard(path)
+            try:
+                # Cache the asset image to prevent re-reading from disk
+                levels = job.result()
+                self.asset_cache[path] = levels[0]
+                self._mip_cache[path] = levels
+                asset_name = os.path.basename(path)
+                item_id = layer["tree"].insert("", "end", values=(asset_name, 1), tags=('unchecked',))
+                layer["assets"][item_id] = {"path": path, "name": asset_name}
+                added += 1
+            except Exception as e:
+                print(f"Failed to load or cache asset {path}: {e}")
+        if jobs:
+            self.status_var.set(f"Loading assets into Layer {layer_index+1}... {total - len(jobs)}/{total}")
+            self.root.after(30, self._check_loads_done, layer_index, jobs, total, added)
+        elif added > 0:
+            self.status_var.set(f"Added {added} new assets to Layer {layer_index+1}.")
 
     def generate_scene(self):
         """Populates the canvas with new, randomly generated asset objects."""
@@ -241,8 +463,9 @@ class SceneEditorApp:
         self.status_var.set("Generating new scene...")
         self.root.update_idletasks()
         
-        self.placed_assets.clear()
+        self._clear_assets()
         self.selected_asset_id = None
+        self._dirty_static = True
         W, H = self.background_image.size
 
         for i, layer_info in enumerate(self.layers):
@@ -266,93 +489,267 @@ class SceneEditorApp:
                     min_r, max_r = min(self.rot_min_var.get(), self.rot_max_var.get()), max(self.rot_min_var.get(), self.rot_max_var.get())
                     rotation = random.uniform(min_r, max_r)
                     
-                    # Temporarily transform to get final size for placement
-                    temp_size = (int(asset_img.width * scale), int(asset_img.height * scale))
-                    temp_img = asset_img.resize(temp_size, Image.Resampling.LANCZOS)
-                    temp_img = temp_img.rotate(rotation, expand=True, resample=Image.Resampling.BICUBIC)
-                    w, h = temp_img.size
+                    # Transform to get final size for placement (cached, so redraw_canvas reuses it)
+                    temp_img = self._get_transformed(asset_path, scale, rotation)
+                    if temp_img is None: continue # Scaled too small
+                    h, w = temp_img.shape[:2]
 
                     placement_zone = layer_info["placement_var"].get()
                     x_range, y_range = self.get_placement_zone(W, H, w, h, placement_zone)
                     if x_range[1] < x_range[0] or y_range[1] < y_range[0]: continue
                     x, y = (random.randint(*x_range), random.randint(*y_range))
 
-                    # Create the asset object and add it to our list
+                    # Create the asset object and add it to our list. Layers are walked in order, so appending
+                    # keeps placed_assets sorted by layer_index (and by insertion order within a layer).
                     asset_object = {
                         "id": str(uuid.uuid4()),
+                        "order": len(self.placed_assets), # Position in draw order, used to find the topmost asset
                         "path": asset_path,
                         "x": x, "y": y,
                         "scale": scale,
                         "rotation": rotation,
                         "layer_index": i,
-                        "bbox": (x, y, x + w, y + h) # Initial bounding box
                     }
                     self.placed_assets.append(asset_object)
+                    self._asset_index[asset_object['id']] = asset_object
+                    self._set_bbox(asset_object, (x, y, x + w, y + h)) # Initial bounding box
 
         self.redraw_canvas()
         self.status_var.set("Scene generation complete! Click assets to edit.")
 
-    def redraw_canvas(self, with_title=True):
-        """The main drawing function. Renders all placed assets onto the background."""
+    def redraw_canvas(self, with_title=True, proxy=False):
+        """
+        The main drawing function. Renders all placed assets onto the background.
+        With proxy=True (used while dragging) the scene is drawn at a reduced resolution that is still at least
+        the size it's shown at, and without the title. Asset positions and bounding boxes stay in full-resolution units.
+        """
         if not self.background_image: return
+        factor = self._proxy_factor() if proxy else 1
+        if factor > 1: with_title = False
         
-        canvas_image = self.background_image.copy()
-
-        # Sort assets by layer so they are drawn in the correct order
-        sorted_assets = sorted(self.placed_assets, key=lambda k: k['layer_index'])
-        
-        for asset_obj in sorted_assets:
-            asset_img = self.asset_cache[asset_obj['path']]
-            
-            # Apply transformations
-            new_size = (int(asset_img.width * asset_obj['scale']), int(asset_img.height * asset_obj['scale']))
-            if new_size[0] < 1 or new_size[1] < 1: continue # Skip if scaled too small
-            
-            transformed_img = asset_img.resize(new_size, Image.Resampling.LANCZOS)
-            transformed_img = transformed_img.rotate(asset_obj['rotation'], expand=True, resample=Image.Resampling.BICUBIC)
-            
-            # Paste onto the main canvas image
-            pos = (int(asset_obj['x']), int(asset_obj['y']))
-            canvas_image.paste(transformed_img, pos, transformed_img)
-            
-            # Update the object's bounding box for future clicks
-            w, h = transformed_img.size
-            asset_obj['bbox'] = (pos[0], pos[1], pos[0] + w, pos[1] + h)
-
-        # Draw selection handles if an asset is selected
-        if self.selected_asset_id:
-            selected = self.get_asset_by_id(self.selected_asset_id)
-            if selected:
-                draw = ImageDraw.Draw(canvas_image)
-                x1, y1, x2, y2 = selected['bbox']
-                draw.rectangle((x1, y1, x2, y2), outline="cyan", width=2)
-                handle_size = 10
-                # Draw resize handle at bottom-right
-                draw.rectangle((x2 - handle_size//2, y2 - handle_size//2, x2 + handle_size//2, y2 + handle_size//2), fill="cyan", outline="black")
+        # While dragging, only the dragged asset changes. Everything else is drawn once into _static_composite,
+        # and each drag frame just pastes the dragged asset (on top) onto it. The frame buffer is reused: only the
+        # area the dragged asset covered last frame is restored from _static_composite, not the whole scene.
+        drag_id = self._drag_data['item_id']
+        if drag_id and not self._dirty_static and self._static_excluded_id == drag_id and self._static_factor == factor:
+            canvas = self._drag_frame
+            if self._drag_dirty:
+                x1, y1, x2, y2 = self._drag_dirty
+                canvas[y1:y2, x1:x2] = self._static_composite[y1:y2, x1:x2]
+        else:
+            canvas = self._get_background_array(factor).copy()
+
+            # placed_assets is already in layer order, so it's drawn as-is
+            for asset_obj in self.placed_assets:
+                if asset_obj['id'] != drag_id:
+                    self._paste_asset(canvas, asset_obj, factor)
+
+            if drag_id:
+                self._static_composite = canvas
+                self._static_excluded_id = drag_id
+                self._static_factor = factor
+                self._dirty_static = False
+                canvas = self._drag_frame = canvas.copy()
+
+        if drag_id:
+            dragged = self.get_asset_by_id(drag_id)
+            # While dragging, the dragged asset is transformed with fast, lower-quality filters (it may change every frame)
+            if dragged:
+                self._paste_asset(canvas, dragged, factor, draft=proxy)
+                # Remember what it covered (bbox is in full-resolution units), to be restored next frame
+                H, W = canvas.shape[:2]
+                x1, y1, x2, y2 = dragged['bbox']
+                self._drag_dirty = (min(max(x1 // factor, 0), W), min(max(y1 // factor, 0), H),
+                                    min(max(-(-x2 // factor), 0), W), min(max(-(-y2 // factor), 0), H))
+        # Back from premultiplied to normal RGBA, once for the whole scene
+        canvas_image = Image.frombuffer("RGBa", (canvas.shape[1], canvas.shape[0]), canvas, "raw", "RGBa", 0, 1).convert("RGBA")
 
         self.generated_scene_no_title = canvas_image
         final_image = self._render_title_on_image(canvas_image) if with_title else canvas_image
-        self.display_image(final_image)
+        self.display_image(final_image, full_size=self.background_image.size, draft=proxy)
 
-    def display_image(self, pil_image):
-        """Displays a PIL image, fitting it to the canvas and storing coordinate mapping info."""
+    def _proxy_factor(self):
+        """How many times (1, 2 or 4) the background can be shrunk and still be at least as big as the display canvas."""
+        canvas_w, canvas_h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if canvas_w <= 1 or canvas_h <= 1:
+            canvas_w, canvas_h = 800, 600 # Fallback
+        W, H = self.background_image.size
+        for factor in (4, 2):
+            if W // factor >= canvas_w and H // factor >= canvas_h:
+                return factor
+        return 1
+
+    def _get_background_array(self, factor):
+        """Returns the background shrunk 'factor' times, as a premultiplied RGBA array (made once per background and factor)."""
+        if factor not in self._background_arrays:
+            W, H = self.background_image.size
+            image = self.background_image.convert("RGBa") # Premultiplied, like the assets (see composite_over)
+            if factor > 1: image = image.resize((W // factor, H // factor), Image.Resampling.BILINEAR)
+            self._background_arrays[factor] = np.asarray(image)
+        return self._background_arrays[factor]
+
+    def _paste_asset(self, canvas, asset_obj, factor=1, draft=False):
+        """
+        Draws one placed asset onto the RGBA array 'canvas' and updates its bounding box.
+        'factor' is how many times smaller 'canvas' is than the background (see redraw_canvas's proxy mode).
+        'draft' is passed on to _get_transformed.
+        """
+        # Skip assets that can't show up at all, before spending time on resizing and rotating them.
+        # Rotated, an asset is never bigger than its diagonal in either direction, and it grows right/down from (x, y).
+        src = self.asset_cache[asset_obj['path']]
+        w, h = src.width * asset_obj['scale'], src.height * asset_obj['scale']
+        if w < 1 or h < 1: return # Scaled too small
+        x, y = int(asset_obj['x']), int(asset_obj['y'])
+        reach = int(math.hypot(w, h)) + 2
+        W, H = self.background_image.size
+        if x + reach < 0 or y + reach < 0 or x > W or y > H:
+            self._set_bbox(asset_obj, (x, y, x + reach, y + reach)) # Off the canvas; a rough box is good enough
+            return
+
+        # Apply transformations
+        transformed_img = self._get_transformed(asset_obj['path'], asset_obj['scale'] / factor, asset_obj['rotation'], draft)
+        if transformed_img is None: return # Skip if scaled too small
+
+        # Composite onto the canvas
+        composite_over(canvas, transformed_img, int(asset_obj['x']) // factor, int(asset_obj['y']) // factor)
+
+        # Update the object's bounding box for future clicks (always in full-resolution units)
+        h, w = transformed_img.shape[:2]
+        self._set_bbox(asset_obj, (x, y, x + w * factor, y + h * factor))
+
+    def _set_bbox(self, asset_obj, bbox):
+        """Sets an asset's bounding box and re-files it under the hit-test grid cells the box now covers."""
+        asset_obj['bbox'] = bbox
+        x1, y1, x2, y2 = bbox
+        cells = {(cx, cy) for cx in range(x1 // HIT_GRID_CELL, x2 // HIT_GRID_CELL + 1)
+                          for cy in range(y1 // HIT_GRID_CELL, y2 // HIT_GRID_CELL + 1)}
+        old_cells = self._asset_cells.get(asset_obj['id'], set())
+        if cells == old_cells: return
+        for cell in old_cells - cells:
+            self._hit_grid[cell].discard(asset_obj['id'])
+            if not self._hit_grid[cell]: del self._hit_grid[cell]
+        for cell in cells - old_cells:
+            self._hit_grid[cell].add(asset_obj['id'])
+        self._asset_cells[asset_obj['id']] = cells
+
+    def _clear_assets(self):
+        """Removes every placed asset, along with its lookup and hit-test entries."""
+        self.placed_assets.clear()
+        self._asset_index.clear()
+        self._hit_grid.clear()
+        self._asset_cells.clear()
+
+    def _get_transformed(self, path, scale, rotation, draft=False):
+        """
+        Returns the asset at 'path' scaled by 'scale' and rotated by 'rotation' degrees, as a premultiplied RGBA array,
+        or None if it would be too small. With draft=True the much faster NEAREST/BILINEAR filters are used
+        instead of LANCZOS/BICUBIC (for dragging).
+        Results are cached (scale rounded to 3 decimals, rotation to 1), so assets that haven't changed
+        since the last redraw are not resized and rotated again. Draft and final versions are cached separately.
+        """
+        key = (path, round(scale, 3), round(rotation, 1), draft)
+        if key in self._transform_cache:
+            self._transform_cache.move_to_end(key) # Mark as most recently used
+            return self._transform_cache[key]
+
+        asset_img = self.asset_cache[path]
+        new_size = (int(asset_img.width * key[1]), int(asset_img.height * key[1]))
+        if new_size[0] < 1 or new_size[1] < 1:
+            transformed_img = None
+        else:
+            # Start from the smallest mipmap that is still at least as big as the result, so a big shrink
+            # only has to read a fraction of the pixels
+            if key[1] < 0.5:
+                levels = self._mip_cache.get(path, [asset_img])
+                level = min(int(math.floor(-math.log2(key[1]))), len(levels) - 1)
+                while level > 0 and (levels[level].width < new_size[0] or levels[level].height < new_size[1]):
+                    level -= 1 # Rounded down too far
+                asset_img = levels[level]
+            if draft or key[1] >= 1:
+                # One resampling pass for both. transform() doesn't smooth when shrinking, which is fine for
+                # draft frames and enlargements.
+                resample = Image.Resampling.BILINEAR if draft else Image.Resampling.BICUBIC
+                transformed_img = np.asarray(_scale_rotate(asset_img, new_size, key[2], resample))
+            else:
+                # Shrinking needs LANCZOS's smoothing to avoid jagged edges, so it stays a separate step
+                transformed_img = asset_img.resize(new_size, Image.Resampling.LANCZOS)
+                transformed_img = np.asarray(transformed_img.rotate(key[2], expand=True, resample=Image.Resampling.BICUBIC))
+
+        self._transform_cache[key] = transformed_img
+        if len(self._transform_cache) > TRANSFORM_CACHE_SIZE:
+            self._transform_cache.popitem(last=False) # Evict the least recently used one
+        return transformed_img
+
+    def display_image(self, pil_image, full_size=None, draft=False):
+        """
+        Displays a PIL image, fitting it to the canvas and storing coordinate mapping info.
+        'full_size' is the size of the full-resolution scene, when 'pil_image' is a reduced-size proxy of it.
+        With draft=True (while dragging) the faster BILINEAR filter is used to shrink it.
+        """
         self.current_scene_image = pil_image
         canvas_w, canvas_h = self.canvas.winfo_width(), self.canvas.winfo_height()
         if canvas_w <= 1 or canvas_h <= 1: 
             canvas_w, canvas_h = 800, 600 # Fallback
-
-        img_copy = pil_image.copy()
-        img_copy.thumbnail((canvas_w, canvas_h), Image.Resampling.LANCZOS)
+        full_w, full_h = full_size or pil_image.size
+
+        # The on-screen size only changes with the scene or canvas size, so it is worked out once and reused.
+        # It comes from the full-resolution size, so a proxy and the final image are shown at exactly the same size.
+        geometry = (full_w, full_h, canvas_w, canvas_h)
+        if self._thumb_geometry is None or self._thumb_geometry[0] != geometry:
+            ratio = min(canvas_w / full_w, canvas_h / full_h, 1.0) # Keeps the aspect ratio, never enlarges
+            self._thumb_geometry = (geometry, (max(1, round(full_w * ratio)), max(1, round(full_h * ratio))))
+        thumb_size = self._thumb_geometry[1]
+
+        # resize() returns a new image, so the scene doesn't need to be copied first
+        if thumb_size == pil_image.size:
+            img_copy = pil_image
+        else:
+            img_copy = pil_image.resize(thumb_size, Image.Resampling.BILINEAR if draft else Image.Resampling.LANCZOS)
         
         # Store info for coordinate conversion
         self._display_info['thumb_w'], self._display_info['thumb_h'] = img_copy.size
-        self._display_info['scale_factor'] = self.current_scene_image.width / self._display_info['thumb_w']
+        self._display_info['scale_factor'] = full_w / self._display_info['thumb_w']
         self._display_info['offset_x'] = (canvas_w - self._display_info['thumb_w']) // 2
         self._display_info['offset_y'] = (canvas_h - self._display_info['thumb_h']) // 2
         
-        self.tk_image = ImageTk.PhotoImage(img_copy)
-        self.canvas.delete("all")
-        self.canvas.create_image(self._display_info['offset_x'], self._display_info['offset_y'], anchor=tk.NW, image=self.tk_image)
+        # Reuse the same Tk image and canvas item from frame to frame: while the size stays the same,
+        # the new pixels are just copied into the existing image.
+        offset = (self._display_info['offset_x'], self._display_info['offset_y'])
+        if self.tk_image is not None and (self.tk_image.width(), self.tk_image.height()) == img_copy.size:
+            self.tk_image.paste(img_copy)
+        else:
+            self.tk_image = ImageTk.PhotoImage(img_copy)
+            if self._canvas_img_id is not None:
+                self.canvas.itemconfig(self._canvas_img_id, image=self.tk_image)
+        if self._canvas_img_id is None:
+            self._canvas_img_id = self.canvas.create_image(*offset, anchor=tk.NW, image=self.tk_image)
+        else:
+            self.canvas.coords(self._canvas_img_id, *offset)
+        self._update_selection_overlay()
+
+    def _update_selection_overlay(self):
+        """
+        Shows the selection outline and resize handle as Tk canvas items on top of the scene image.
+        They are only moved on each redraw, so the selection never has to be drawn into the scene's pixels.
+        """
+        selected = self.get_asset_by_id(self.selected_asset_id) if self.selected_asset_id else None
+        if not selected:
+            if self._selection_ids:
+                for item_id in self._selection_ids: self.canvas.delete(item_id)
+                self._selection_ids = None
+            return
+        # Full-resolution bbox -> display coordinates
+        scale, ox, oy = self._display_info['scale_factor'], self._display_info['offset_x'], self._display_info['offset_y']
+        x1, y1, x2, y2 = (v / scale + o for v, o in zip(selected['bbox'], (ox, oy, ox, oy)))
+        half = 5 # Half the resize handle's size, in screen pixels
+        if self._selection_ids is None:
+            self._selection_ids = (self.canvas.create_rectangle(x1, y1, x2, y2, outline="cyan", width=2, tags="sel"),
+                                   self.canvas.create_rectangle(x2 - half, y2 - half, x2 + half, y2 + half, fill="cyan", outline="black", tags="sel"))
+        else:
+            outline_id, handle_id = self._selection_ids
+            self.canvas.coords(outline_id, x1, y1, x2, y2)
+            self.canvas.coords(handle_id, x2 - half, y2 - half, x2 + half, y2 + half)
+        self.canvas.tag_raise("sel")
     
     # --- Direct Manipulation Handlers ---
     
@@ -367,8 +764,11 @@ class SceneEditorApp:
         click_x, click_y = self._display_to_image_coords(event.x, event.y)
         
         self.selected_asset_id = None
-        # Iterate in reverse draw order to select the topmost asset
-        for asset_obj in reversed(sorted(self.placed_assets, key=lambda k: k['layer_index'])):
+        # Only the assets filed under the clicked grid cell can be hit (see _set_bbox).
+        # Check them in reverse draw order to select the topmost one.
+        cell = (click_x // HIT_GRID_CELL, click_y // HIT_GRID_CELL)
+        candidates = [self._asset_index[asset_id] for asset_id in self._hit_grid.get(cell, ())]
+        for asset_obj in sorted(candidates, key=lambda k: k['order'], reverse=True):
             x1, y1, x2, y2 = asset_obj['bbox']
             if x1 <= click_x <= x2 and y1 <= click_y <= y2:
                 self.selected_asset_id = asset_obj['id']
@@ -387,13 +787,31 @@ class SceneEditorApp:
         self.redraw_canvas()
 
     def on_canvas_drag(self, event):
-        """Handles moving or resizing the selected asset."""
+        """
+        Handles moving or resizing the selected asset.
+        Tk sends a motion event for every pixel the mouse moves, so only the latest position is remembered here;
+        _flush_drag applies it and redraws once the event loop is idle, at most once per batch of events.
+        """
         if not self._drag_data["item_id"]: return
-        
+        self._pending_drag = self._display_to_image_coords(event.x, event.y)
+        if not self._drag_redraw_scheduled:
+            self._drag_redraw_scheduled = True
+            self.root.after_idle(self._flush_drag)
+
+    def _flush_drag(self):
+        """Applies the latest drag position (see on_canvas_drag) and redraws."""
+        self._drag_redraw_scheduled = False
+        if self._apply_pending_drag():
+            self.redraw_canvas(with_title=False, proxy=True) # Redraw at reduced resolution without title for performance
+
+    def _apply_pending_drag(self):
+        """Moves or resizes the dragged asset to the latest drag position. Returns True if anything was applied."""
+        if self._pending_drag is None: return False
+        new_x, new_y = self._pending_drag
+        self._pending_drag = None
         item = self.get_asset_by_id(self._drag_data["item_id"])
-        if not item: return
+        if not item: return False
 
-        new_x, new_y = self._display_to_image_coords(event.x, event.y)
         dx = new_x - self._drag_data['x']
         dy = new_y - self._drag_data['y']
 
@@ -410,28 +828,33 @@ class SceneEditorApp:
 
         self._drag_data['x'] = new_x
         self._drag_data['y'] = new_y
-        self.redraw_canvas(with_title=False) # Redraw without title for performance
+        return True
 
     def on_canvas_release(self, event):
         """Finalizes the drag operation."""
-        if self._drag_data['item_id']:
-            self.redraw_canvas() # Final redraw with title
+        was_dragging = self._drag_data['item_id']
+        if was_dragging: self._apply_pending_drag() # A last position that hasn't been drawn yet
         self._drag_data = {"x": 0, "y": 0, "item_id": None, "mode": None}
+        self._dirty_static = True
+        if was_dragging:
+            self.redraw_canvas() # Final redraw with title, with the asset back in its own layer
     
     def delete_selected_asset(self, event=None):
         """Deletes the currently selected asset."""
         if self.selected_asset_id:
-            self.placed_assets = [p for p in self.placed_assets if p['id'] != self.selected_asset_id]
+            asset_obj = self._asset_index.pop(self.selected_asset_id, None)
+            if asset_obj is not None:
+                self.placed_assets.remove(asset_obj)
+                for cell in self._asset_cells.pop(asset_obj['id'], ()):
+                    self._hit_grid[cell].discard(asset_obj['id'])
             self.selected_asset_id = None
+            self._dirty_static = True
             self.redraw_canvas()
             self.status_var.set("Asset deleted.")
 
     def get_asset_by_id(self, asset_id):
         """Helper to find a placed asset by its unique ID."""
-        for asset_obj in self.placed_assets:
-            if asset_obj['id'] == asset_id:
-                return asset_obj
-        return None
+        return self._asset_index.get(asset_id)
         
     # --- Other Helper and Action Methods (mostly unchanged) ---
     def add_title(self):
@@ -464,7 +887,7 @@ class SceneEditorApp:
             W, H = width_var.get(), height_var.get()
             if W > 0 and H > 0:
                 self.background_image = Image.new("RGBA", (W, H), color_var.get())
-                self.placed_assets.clear(); self.selected_asset_id = None
+                self._clear_assets(); self.selected_asset_id = None; self._dirty_static = True; self._background_arrays = {}
                 self.redraw_canvas(); self.status_var.set(f"Created new {W}x{H} canvas.")
                 dialog.destroy()
         ttk.Button(dialog, text="Create", command=on_create).grid(row=3, column=0, columnspan=3, pady=10)
@@ -473,8 +896,10 @@ class SceneEditorApp:
         path = filedialog.askopenfilename(filetypes=[("Images", "*.png *.jpg *.jpeg")])
         if not path: return
         self.background_image = Image.open(path).convert("RGBA")
-        self.placed_assets.clear()
+        self._clear_assets()
         self.selected_asset_id = None
+        self._dirty_static = True
+        self._background_arrays = {}
         self.redraw_canvas()
         self.status_var.set(f"Loaded background: {os.path.basename(path)}")
 
@@ -537,10 +962,7 @@ class SceneEditorApp:
         if not self.title_text_var.get().strip(): return base_image
         image_with_title = base_image.copy(); draw = ImageDraw.Draw(image_with_title)
         text = self.title_text_var.get(); font_name = self.title_font_var.get(); font_size = self.title_size_var.get()
-        try:
-            font_path = fm.findfont(fm.FontProperties(family=font_name))
-            font = ImageFont.truetype(font_path, font_size)
-        except Exception: font = ImageFont.load_default()
+        font = _get_font(font_name, font_size) # Cached, see _get_font
         W, H = image_with_title.size; bbox = draw.textbbox((0,0), text, font=font)
         text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
         pos_map = {"Center": ((W-text_w)//2, (H-text_h)//2), "Top Center": ((W-text_w)//2, 10),"Bottom Center": ((W-text_w)//2, H-text_h-10), "Top Left": (10, 10),"Bottom Right": (W-text_w-10, H-text_h-10)}
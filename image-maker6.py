@@ -1,14 +1,61 @@
 # === 1. IMPORTS ===
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser
+import PIL
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import os
-import random
 import uuid
 import math
+import functools
+from collections import OrderedDict
+import numpy as np
 import matplotlib.font_manager as fm
 from tkinterdnd2 import DND_FILES, TkinterDnD
 
+# Pillow-SIMD is a drop-in Pillow build whose resize/rotate use AVX2; this file needs no changes to benefit: pip uninstall pillow && pip install pillow-simd
+PILLOW_SIMD = ".post" in PIL.__version__ or "simd" in PIL.__version__.lower() # Its versions look like "9.5.0.post1"
+TRANSFORM_CACHE_SIZE = 256 # How many resized+rotated asset images _get_transformed keeps
+# Placement zones as (left, right, top, bottom) edges in sixths of the scene, so thirds and halves both come out as exact integer math (W*2//6 == W//3)
+PLACEMENT_ZONES = {"Top Left": (0, 2, 0, 2), "Top Center": (2, 4, 0, 2), "Top Right": (4, 6, 0, 2),
+                   "Middle Left": (0, 2, 2, 4), "Center": (2, 4, 2, 4), "Middle Right": (4, 6, 2, 4),
+                   "Bottom Left": (0, 2, 4, 6), "Bottom Center": (2, 4, 4, 6), "Bottom Right": (4, 6, 4, 6),
+                   "Top Half": (0, 6, 0, 3), "Bottom Half": (0, 6, 3, 6), "Left Half": (0, 3, 0, 6), "Right Half": (3, 6, 0, 6)}
+
+@functools.lru_cache(maxsize=None)
+def _resolve_font(family):
+    # fm.findfont searches matplotlib's whole font list, so each family is only looked up once
+    return fm.findfont(fm.FontProperties(family=family))
+
+def _rotated_size(w, h, degrees):
+    # The size Image.rotate(degrees, expand=True) gives a w x h image, worked out the way Pillow does it, without rotating any pixels
+    degrees %= 360.0
+    if degrees in (0, 180): return w, h
+    if degrees in (90, 270): return h, w
+    rad = -math.radians(degrees); a, b = round(math.cos(rad), 15), round(math.sin(rad), 15)
+    c = a * -(w / 2) + b * -(h / 2) + w / 2; f = -b * -(w / 2) + a * -(h / 2) + h / 2
+    xx = [a * x + b * y + c for x, y in ((0, 0), (w, 0), (w, h), (0, h))]; yy = [-b * x + a * y + f for x, y in ((0, 0), (w, 0), (w, h), (0, h))]
+    return math.ceil(max(xx)) - math.floor(min(xx)), math.ceil(max(yy)) - math.floor(min(yy))
+
+def _draw_check_box(checked):
+    # The 16x16 tick box shown next to each asset in the layer lists
+    im = Image.new("RGBA", (16, 16), (0,0,0,0)); draw = ImageDraw.Draw(im)
+    if checked:
+        draw.rectangle((2,2,12,12), outline="black", fill="dodgerblue"); draw.line([(4,8), (7,11), (12,4)], fill="white", width=2)
+    else:
+        draw.rectangle((2,2,12,12), outline="black")
+    return im
+
+def _composite_over(dst, src, x, y):
+    # Alpha-composites the premultiplied RGBA array 'src' onto the premultiplied RGBA array 'dst' at (x, y), in place.
+    # Premultiplied, every channel is just: result = asset + canvas * (1 - asset alpha)
+    # Matches Image.alpha_composite to within rounding (premultiplying to uint8 can move a channel by 1 on opaque backgrounds)
+    h, w = src.shape[:2]; H, W = dst.shape[:2]
+    x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, W), min(y + h, H)
+    if x0 >= x1 or y0 >= y1: return
+    s = src[y0 - y:y1 - y, x0 - x:x1 - x]; d = dst[y0:y1, x0:x1]
+    keep = 1.0 - s[..., 3:4] * np.float32(1 / 255) # The alpha column, broadcast over all 4 channels
+    d[...] = np.minimum(s + d * keep + 0.5, 255) # (Capped: bicubic rotation can leave a color slightly above its alpha)
+
 # === 2. MAIN APPLICATION CLASS ===
 class SceneEditorApp:
     # --- 2.1. INITIALIZATION ---
@@ -18,27 +65,51 @@ class SceneEditorApp:
         self.root.state('zoomed')
 
         # --- Core Data Structures ---
-        self.background_image = None
+        self.background_image = None # At its original resolution, kept for saving
+        self._background_working = None # The background shrunk to fit the screen: scenes are edited and drawn at this size
+        self._work_scale = 1.0 # _background_working size / background_image size. Positions and bboxes are in working pixels, asset 'scale' stays relative to the original
         self.generated_scene_no_title = None
         self.current_scene_image = None
         self.tk_image = None
+        self._canvas_img_id = None # The canvas item showing tk_image
+        self._overlay_ids = [] # Canvas items of the selection overlay, see _draw_overlay
         
         self.asset_cache = {}
-        self.placed_assets = []
+        self._transformed_cache = OrderedDict() # (path, scale, rotation) -> resized+rotated asset, least recently used first
+        self._rng = np.random.default_rng() # generate_scene draws each asset's random values in one batch
+        self.placed_assets = [] # Always in draw order: generate_scene adds them layer by layer
+        self._assets_by_id = {} # id -> entry of placed_assets, kept in step with it
+        self._check_images = {checked: ImageTk.PhotoImage(_draw_check_box(checked)) for checked in (True, False)} # Shared by every layer's tree
         self.selected_asset_id = None
         self._drag_data = {"x": 0, "y": 0, "item_id": None, "mode": None}
+        self._background_array = None # _background_working as a premultiplied RGBA array, which scenes are composited on
+        self._scratch = None # The array each redraw composites into, reused for as long as the scene size stays the same
+        self._static_bg_cache = None # While dragging: the background with every asset except the dragged one already pasted
+        self._static_bg_id = None # The id of the asset left out of _static_bg_cache
+        self._pending_drag = None # Latest drag position (image pixels) not applied yet, see on_canvas_drag
+        self._drag_redraw_scheduled = False
+        self._font_cache = {} # (font_name, font_size) -> loaded ImageFont, so the title doesn't re-parse the font file on every redraw
+        self._title_cache = {"key": None, "layer": None, "pos": None} # The title pre-drawn on a transparent layer, see _render_title_on_image
 
         # --- Pan & Zoom State ---
         self._zoom_level = 1.0
         self._view_x = 0; self._view_y = 0
         self._pan_start_x = 0; self._pan_start_y = 0
+        self._interactive = False # True while dragging/panning/zooming: frames are drawn with faster, lower-quality filters until it ends
+        self._wheel_end_job = None # Pending after() call that ends a mouse-wheel zoom
+        self._zoom_pyramid = {} # Shrink factor (1, 2, 4, 8) -> current_scene_image shrunk that many times, made as display_image needs them
         
         try:
             font_paths = fm.findSystemFonts(fontpaths=None, fontext='ttf')
-            unique_font_names = {fm.FontProperties(fname=font_path).get_name() for font_path in font_paths}
-            self.system_fonts = sorted(list(unique_font_names))
+            paths_by_name = {}
+            for font_path in font_paths: paths_by_name.setdefault(fm.FontProperties(fname=font_path).get_name(), []).append(font_path)
+            self.system_fonts = sorted(paths_by_name)
+            # Name -> file for fonts that have a single file, so the title can load them without asking fm.findfont
+            # (families with several files, like Bold/Italic variants, are left to _resolve_font, which picks the regular one)
+            self._font_path_by_name = {name: paths[0] for name, paths in paths_by_name.items() if len(paths) == 1}
         except Exception as e:
             print(f"Font loading failed: {e}")
+            self._font_path_by_name = {}
             self.system_fonts = ["Arial", "Courier New", "Times New Roman"]
 
         # --- NEW: Layer Data with Per-Layer Settings ---
@@ -67,7 +138,7 @@ class SceneEditorApp:
         self.canvas = tk.Canvas(self.image_frame, background='black', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
-        self.status_var = tk.StringVar(value="Welcome! Use mouse wheel to scroll controls or zoom preview.")
+        self.status_var = tk.StringVar(value="Welcome! Use mouse wheel to scroll controls or zoom preview." + ("" if PILLOW_SIMD else " (Tip: install pillow-simd for faster redraws.)"))
         ttk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN).pack(side=tk.BOTTOM, fill=tk.X)
 
         # --- Event Bindings ---
@@ -77,8 +148,10 @@ class SceneEditorApp:
         self.root.bind("<Delete>", self.delete_selected_asset)
         self.root.bind("<BackSpace>", self.delete_selected_asset)
         self.canvas.bind("<MouseWheel>", self.on_mouse_wheel); self.canvas.bind("<Button-4>", self.on_mouse_wheel); self.canvas.bind("<Button-5>", self.on_mouse_wheel)
-        self.canvas.bind("<ButtonPress-2>", self.on_pan_start); self.canvas.bind("<B2-Motion>", self.on_pan_drag)
+        self.canvas.bind("<ButtonPress-2>", self.on_pan_start); self.canvas.bind("<B2-Motion>", self.on_pan_drag); self.canvas.bind("<ButtonRelease-2>", self.on_pan_release)
         self.canvas.bind("<Configure>", lambda e: self.display_image(self.current_scene_image))
+        # One wheel binding on the window's bindtag covers every control; the handler only scrolls when the pointer is over the control panel
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.root.bind(seq, self._on_mouse_wheel_controls, add="+")
 
     # --- 2.2. UI CREATION METHODS ---
     def _create_scrollable_controls(self):
@@ -88,19 +161,14 @@ class SceneEditorApp:
         self.scrollable_frame.bind("<Configure>", lambda e: container_canvas.configure(scrollregion=container_canvas.bbox("all")))
         container_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         container_canvas.configure(yscrollcommand=scrollbar.set)
-        self._bind_mouse_wheel_recursive(container_canvas)
         container_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         self._populate_controls(self.scrollable_frame)
 
-    def _bind_mouse_wheel_recursive(self, widget):
-        widget.bind("<MouseWheel>", self._on_mouse_wheel_controls)
-        widget.bind("<Button-4>", self._on_mouse_wheel_controls)
-        widget.bind("<Button-5>", self._on_mouse_wheel_controls)
-        for child in widget.winfo_children():
-            self._bind_mouse_wheel_recursive(child)
-            
     def _on_mouse_wheel_controls(self, event):
+        # Asked by path name, since widgets Tk creates itself (like a combobox's popdown list) have no tkinter object
+        under_pointer = self.root.tk.call("winfo", "containing", event.x_root, event.y_root)
+        if not (str(under_pointer) + ".").startswith(str(self.control_panel) + "."): return
         canvas = self.control_panel.winfo_children()[0]
         if event.num == 5 or event.delta < 0: canvas.yview_scroll(1, "units")
         elif event.num == 4 or event.delta > 0: canvas.yview_scroll(-1, "units")
@@ -123,9 +191,6 @@ class SceneEditorApp:
         ttk.Style().configure("Accent.TButton", font=('Arial', 12, 'bold'), foreground='green')
         ttk.Button(action_frame, text="GENERATE NEW SCENE", command=self.generate_scene, style="Accent.TButton").pack(fill=tk.X, ipady=5, pady=2)
         ttk.Button(action_frame, text="Save Final Image...", command=self.save_scene).pack(fill=tk.X, pady=2)
-        
-        # After all widgets are created, bind mouse wheel to all of them
-        self._bind_mouse_wheel_recursive(self.scrollable_frame)
 
     def _create_layer_ui(self, parent, layer_index):
         layer_info = self.layers[layer_index]
@@ -195,16 +260,7 @@ class SceneEditorApp:
         color_code = colorchooser.askcolor(title="Choose color")
         if color_code and color_code[1]: var_to_update.set(color_code[1])
         
-    def get_check_image(self, checked):
-        if not hasattr(self, '_check_images'): self._check_images = {}
-        if checked in self._check_images: return self._check_images[checked]
-        im = Image.new("RGBA", (16, 16), (0,0,0,0)); draw = ImageDraw.Draw(im)
-        if checked:
-            draw.rectangle((2,2,12,12), outline="black", fill="dodgerblue"); draw.line([(4,8), (7,11), (12,4)], fill="white", width=2)
-        else:
-            draw.rectangle((2,2,12,12), outline="black")
-        photo = ImageTk.PhotoImage(im); self._check_images[checked] = photo
-        return photo
+    def get_check_image(self, checked): return self._check_images[checked]
         
     def edit_tree_cell(self, event, tree):
         item_id = tree.identify_row(event.y); column_id = tree.identify_column(event.x)
@@ -225,19 +281,31 @@ class SceneEditorApp:
         
     def _render_title_on_image(self, base_image):
         if not self.title_text_var.get().strip(): return base_image
-        image_with_title = base_image.copy(); draw = ImageDraw.Draw(image_with_title)
-        text = self.title_text_var.get(); font_name = self.title_font_var.get(); font_size = self.title_size_var.get()
-        try:
-            font_path = fm.findfont(fm.FontProperties(family=font_name)); font = ImageFont.truetype(font_path, font_size)
-        except Exception: font = ImageFont.load_default()
-        W, H = image_with_title.size; bbox = draw.textbbox((0,0), text, font=font)
-        text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        pos_map = {"Center": ((W-text_w)//2, (H-text_h)//2), "Top Center": ((W-text_w)//2, 10),"Bottom Center": ((W-text_w)//2, H-text_h-10), "Top Left": (10, 10),"Bottom Right": (W-text_w-10, H-text_h-10)}
-        x, y = pos_map.get(self.title_pos_var.get(), (10,10))
-        if self.shadow_enabled_var.get():
-            shadow_offset = int(font_size * 0.05) + 2
-            draw.text((x + shadow_offset, y + shadow_offset), text, font=font, fill=self.shadow_color_var.get())
-        draw.text((x,y), text, font=font, fill=self.title_color_var.get())
+        text = self.title_text_var.get(); font_name = self.title_font_var.get(); font_size = max(1, round(self.title_size_var.get() * self._work_scale)) # Sized for the original background
+        W, H = base_image.size
+        # The title is drawn once into its own small transparent layer, which is reused until a title setting (or the scene size) changes
+        key = (text, font_name, font_size, self.title_color_var.get(), self.shadow_enabled_var.get(), self.shadow_color_var.get(), self.title_pos_var.get(), W, H)
+        if self._title_cache["key"] != key:
+            font = self._font_cache.get((font_name, font_size))
+            if font is None:
+                try:
+                    font = ImageFont.truetype(self._font_path_by_name.get(font_name) or _resolve_font(font_name), font_size)
+                except Exception: font = ImageFont.load_default()
+                self._font_cache[(font_name, font_size)] = font
+            bbox = ImageDraw.Draw(base_image).textbbox((0,0), text, font=font)
+            text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+            pos_map = {"Center": ((W-text_w)//2, (H-text_h)//2), "Top Center": ((W-text_w)//2, 10),"Bottom Center": ((W-text_w)//2, H-text_h-10), "Top Left": (10, 10),"Bottom Right": (W-text_w-10, H-text_h-10)}
+            x, y = pos_map.get(self.title_pos_var.get(), (10,10))
+            shadow_offset = int(font_size * 0.05) + 2 if self.shadow_enabled_var.get() else 0
+            layer = Image.new("RGBA", (max(1, text_w + shadow_offset), max(1, text_h + shadow_offset)), (0,0,0,0)); draw = ImageDraw.Draw(layer)
+            if shadow_offset: draw.text((shadow_offset - bbox[0], shadow_offset - bbox[1]), text, font=font, fill=self.shadow_color_var.get())
+            draw.text((-bbox[0], -bbox[1]), text, font=font, fill=self.title_color_var.get())
+            # alpha_composite can't place a layer at a negative position, so any part above/left of the image is cut off first
+            lx, ly = x + bbox[0], y + bbox[1]
+            layer = layer.crop((max(0, -lx), max(0, -ly), layer.width, layer.height))
+            self._title_cache = {"key": key, "layer": layer, "pos": (max(0, lx), max(0, ly))}
+        image_with_title = base_image.copy()
+        image_with_title.alpha_composite(self._title_cache["layer"], self._title_cache["pos"])
         return image_with_title
     
     # --- ALL OTHER METHODS IN FULL ---
@@ -250,7 +318,14 @@ class SceneEditorApp:
         post_zoom_x, post_zoom_y = self._display_to_image_coords(event.x, event.y)
         self._view_x += pre_zoom_x - post_zoom_x
         self._view_y += pre_zoom_y - post_zoom_y
+        # The wheel has no release event: the zoom counts as finished once the wheel has been still for a moment
+        self._interactive = True
+        if self._wheel_end_job: self.root.after_cancel(self._wheel_end_job)
+        self._wheel_end_job = self.root.after(150, self._end_wheel_zoom)
         self.display_image(self.current_scene_image)
+    def _end_wheel_zoom(self):
+        self._wheel_end_job = None; self._interactive = False
+        self.display_image(self.current_scene_image) # Redisplay at full quality
     def on_pan_start(self, event): self._pan_start_x = event.x; self._pan_start_y = event.y
     def on_pan_drag(self, event):
         if not self.background_image: return
@@ -258,9 +333,13 @@ class SceneEditorApp:
         self._view_x -= dx * (self.current_scene_image.width / self.canvas.winfo_width()) / self._zoom_level
         self._view_y -= dy * (self.current_scene_image.height / self.canvas.winfo_height()) / self._zoom_level
         self._pan_start_x = event.x; self._pan_start_y = event.y
+        self._interactive = True
         self.display_image(self.current_scene_image)
+    def on_pan_release(self, event):
+        if self._interactive: self._interactive = False; self.display_image(self.current_scene_image) # Redisplay at full quality
     def display_image(self, pil_image):
-        if not pil_image: self.canvas.delete("all"); return
+        if not pil_image: self.canvas.delete("all"); self._canvas_img_id = None; self._overlay_ids = []; return
+        if pil_image is not self.current_scene_image or 1 not in self._zoom_pyramid: self._zoom_pyramid = {1: pil_image}
         self.current_scene_image = pil_image
         canvas_w, canvas_h = self.canvas.winfo_width(), self.canvas.winfo_height()
         if canvas_w <= 1 or canvas_h <= 1: return
@@ -268,11 +347,51 @@ class SceneEditorApp:
         view_h = self.current_scene_image.height / self._zoom_level
         self._view_x = max(0, min(self._view_x, self.current_scene_image.width - view_w))
         self._view_y = max(0, min(self._view_y, self.current_scene_image.height - view_h))
-        box = (self._view_x, self._view_y, self._view_x + view_w, self._view_y + view_h)
-        visible_region = self.current_scene_image.crop(box)
-        display_img = visible_region.resize((canvas_w, canvas_h), Image.Resampling.LANCZOS)
-        self.tk_image = ImageTk.PhotoImage(display_img)
-        self.canvas.delete("all"); self.canvas.create_image(0, 0, anchor=tk.NW, image=self.tk_image)
+        # Zoomed out, the view is resized from a pre-shrunk copy of the scene that is still at least canvas-sized, instead of from every full-resolution pixel
+        factor = 1
+        while factor < 8 and view_w / (factor * 2) >= canvas_w and view_h / (factor * 2) >= canvas_h: factor *= 2
+        if factor not in self._zoom_pyramid:
+            level = 1
+            while level < factor:
+                if level * 2 not in self._zoom_pyramid: self._zoom_pyramid[level * 2] = self._zoom_pyramid[level].reduce(2)
+                level *= 2
+        box = tuple(v / factor for v in (self._view_x, self._view_y, self._view_x + view_w, self._view_y + view_h))
+        visible_region = self._zoom_pyramid[factor].crop(box)
+        display_img = visible_region.resize((canvas_w, canvas_h), Image.Resampling.BILINEAR if self._interactive else Image.Resampling.LANCZOS)
+        # One Tk image is reused for every frame: new pixels are pasted into it, and it is only replaced when the canvas changes size
+        if self.tk_image is not None and (self.tk_image.width(), self.tk_image.height()) == display_img.size: self.tk_image.paste(display_img)
+        else:
+            self.tk_image = ImageTk.PhotoImage(display_img)
+            if self._canvas_img_id is not None: self.canvas.itemconfig(self._canvas_img_id, image=self.tk_image)
+        if self._canvas_img_id is None: self._canvas_img_id = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.tk_image)
+        self._draw_overlay()
+    def _draw_overlay(self):
+        # The selection box and its resize/rotate handles are Tk canvas items on top of the image, so selecting or moving them never touches the scene's pixels
+        selected = self.get_asset_by_id(self.selected_asset_id)
+        if not selected or 'bbox' not in selected or not self.current_scene_image:
+            for item_id in self._overlay_ids: self.canvas.delete(item_id)
+            self._overlay_ids = []; return
+        x1, y1, x2, y2 = selected['bbox']
+        handle_size = 10
+        center_x, center_y = x1 + (x2 - x1) / 2, y1 + (y2 - y1) / 2
+        handle_dist = 25; angle_rad = math.radians(-selected['rotation'])
+        rot_handle_x = center_x + (handle_dist + (y1 - center_y)) * math.sin(angle_rad)
+        rot_handle_y = center_y + (handle_dist + (y1 - center_y)) * -math.cos(angle_rad)
+        selected['rot_handle_pos'] = (rot_handle_x, rot_handle_y)
+        # Image pixels -> canvas pixels
+        to_d = self._image_to_display_coords
+        shapes = [("rectangle", (*to_d(x1, y1), *to_d(x2, y2)), dict(outline="cyan", width=2)),
+                  ("rectangle", (*to_d(x2 - handle_size, y2 - handle_size), *to_d(x2 + handle_size, y2 + handle_size)), dict(fill="cyan", outline="black")),
+                  ("line", (*to_d(center_x, center_y), *to_d(rot_handle_x, rot_handle_y)), dict(fill="cyan", width=2)),
+                  ("oval", (*to_d(rot_handle_x - 6, rot_handle_y - 6), *to_d(rot_handle_x + 6, rot_handle_y + 6)), dict(fill="cyan", outline="black"))]
+        if not self._overlay_ids:
+            self._overlay_ids = [getattr(self.canvas, "create_" + kind)(*coords, **opts) for kind, coords, opts in shapes]
+        else:
+            for item_id, (kind, coords, opts) in zip(self._overlay_ids, shapes): self.canvas.coords(item_id, *coords)
+    def _image_to_display_coords(self, img_x, img_y):
+        canvas_w = self.canvas.winfo_width(); canvas_h = self.canvas.winfo_height()
+        return ((img_x - self._view_x) * canvas_w * self._zoom_level / self.current_scene_image.width,
+                (img_y - self._view_y) * canvas_h * self._zoom_level / self.current_scene_image.height)
     def _display_to_image_coords(self, event_x, event_y):
         if not self.current_scene_image: return 0, 0
         canvas_w = self.canvas.winfo_width(); canvas_h = self.canvas.winfo_height()
@@ -282,33 +401,57 @@ class SceneEditorApp:
         return int(img_x), int(img_y)
     def redraw_canvas(self, with_title=True):
         if not self.background_image: return
-        canvas_image = self.background_image.copy()
-        sorted_assets = sorted(self.placed_assets, key=lambda k: k['layer_index'])
-        for asset_obj in sorted_assets:
-            asset_img = self.asset_cache[asset_obj['path']]
-            new_size = (int(asset_img.width * asset_obj['scale']), int(asset_img.height * asset_obj['scale']))
-            if new_size[0] < 1 or new_size[1] < 1: continue
-            transformed_img = asset_img.resize(new_size, Image.Resampling.LANCZOS).rotate(asset_obj['rotation'], expand=True, resample=Image.Resampling.BICUBIC)
-            pos = (int(asset_obj['x']), int(asset_obj['y']))
-            canvas_image.paste(transformed_img, pos, transformed_img)
-            w, h = transformed_img.size
-            asset_obj['bbox'] = (pos[0], pos[1], pos[0] + w, pos[1] + h)
-        if self.selected_asset_id:
-            selected = self.get_asset_by_id(self.selected_asset_id)
-            if selected:
-                draw = ImageDraw.Draw(canvas_image)
-                x1, y1, x2, y2 = selected['bbox']; draw.rectangle((x1, y1, x2, y2), outline="cyan", width=2)
-                handle_size = 10; draw.rectangle((x2 - handle_size, y2 - handle_size, x2 + handle_size, y2 + handle_size), fill="cyan", outline="black")
-                center_x, center_y = x1 + (x2 - x1) / 2, y1 + (y2 - y1) / 2
-                handle_dist = 25; angle_rad = math.radians(-selected['rotation'])
-                rot_handle_x = center_x + (handle_dist + (y1 - center_y)) * math.sin(angle_rad)
-                rot_handle_y = center_y + (handle_dist + (y1 - center_y)) * -math.cos(angle_rad)
-                draw.line([(center_x, center_y), (rot_handle_x, rot_handle_y)], fill="cyan", width=2)
-                draw.ellipse([(rot_handle_x-6, rot_handle_y-6), (rot_handle_x+6, rot_handle_y+6)], fill="cyan", outline="black")
-                selected['rot_handle_pos'] = (rot_handle_x, rot_handle_y)
+        # During a drag only the dragged asset moves: everything else is composited once into _static_bg_cache and each frame pastes just that one asset on a copy of it
+        drag_id = self._drag_data.get('item_id')
+        if drag_id and self._static_bg_cache is not None and self._static_bg_id == drag_id:
+            canvas = self._fill_scratch(self._static_bg_cache)
+        else:
+            if self._background_array is None: self._background_array = np.asarray(self._background_working.convert("RGBa"))
+            canvas = self._fill_scratch(self._background_array)
+            for asset_obj in self.placed_assets:
+                if asset_obj['id'] != drag_id: self._paste_asset(canvas, asset_obj)
+            if drag_id: self._static_bg_cache = canvas.copy(); self._static_bg_id = drag_id
+        if drag_id:
+            dragged = self.get_asset_by_id(drag_id)
+            if dragged: self._paste_asset(canvas, dragged, draft=self._interactive)
+        canvas_image = Image.frombuffer("RGBa", (canvas.shape[1], canvas.shape[0]), canvas, "raw", "RGBa", 0, 1).convert("RGBA")
         self.generated_scene_no_title = canvas_image
         final_image = self._render_title_on_image(canvas_image) if with_title else canvas_image
         self.display_image(final_image)
+    def _fill_scratch(self, source):
+        # Copies 'source' into the reusable scratch array instead of allocating a new one each frame (the image made from it is converted to a copy anyway)
+        if self._scratch is None or self._scratch.shape != source.shape: self._scratch = np.empty_like(source)
+        np.copyto(self._scratch, source); return self._scratch
+    def _paste_asset(self, canvas, asset_obj, draft=False):
+        scale = asset_obj['scale'] * self._work_scale
+        size = self._transformed_size(asset_obj['path'], scale, asset_obj['rotation'])
+        if size is None: return
+        pos = (int(asset_obj['x']), int(asset_obj['y']))
+        asset_obj['bbox'] = (pos[0], pos[1], pos[0] + size[0], pos[1] + size[1])
+        # An asset dragged fully off the canvas doesn't need transforming at all
+        if pos[0] >= canvas.shape[1] or pos[1] >= canvas.shape[0] or pos[0] + size[0] <= 0 or pos[1] + size[1] <= 0: return
+        _composite_over(canvas, self._get_transformed(asset_obj['path'], scale, asset_obj['rotation'], draft), *pos)
+    def _transformed_size(self, path, scale, rotation):
+        # The (width, height) _get_transformed's result will have, or None if it scales to nothing
+        asset_img = self.asset_cache[path]; scale = round(scale, 3)
+        new_size = (int(asset_img.width * scale), int(asset_img.height * scale))
+        if new_size[0] < 1 or new_size[1] < 1: return None
+        return _rotated_size(*new_size, round(rotation))
+    def _get_transformed(self, path, scale, rotation, draft=False):
+        # Resizing and rotating are the slowest part of a redraw, so results are cached (scale rounded to 3 decimals, rotation to whole degrees)
+        # draft=True (for an asset being dragged) uses the much faster BILINEAR/NEAREST filters; those results are cached separately
+        # Returns a premultiplied RGBA array, ready for _composite_over
+        key = (path, round(scale, 3), round(rotation), draft)
+        if key in self._transformed_cache:
+            self._transformed_cache.move_to_end(key); return self._transformed_cache[key]
+        asset_img = self.asset_cache[path]
+        new_size = (int(asset_img.width * key[1]), int(asset_img.height * key[1]))
+        if new_size[0] < 1 or new_size[1] < 1: transformed_img = None
+        elif draft: transformed_img = np.asarray(asset_img.resize(new_size, Image.Resampling.BILINEAR).rotate(key[2], expand=True, resample=Image.Resampling.NEAREST))
+        else: transformed_img = np.asarray(asset_img.resize(new_size, Image.Resampling.LANCZOS).rotate(key[2], expand=True, resample=Image.Resampling.BICUBIC))
+        self._transformed_cache[key] = transformed_img
+        if len(self._transformed_cache) > TRANSFORM_CACHE_SIZE: self._transformed_cache.popitem(last=False)
+        return transformed_img
     def on_canvas_press(self, event):
         click_x, click_y = self._display_to_image_coords(event.x, event.y)
         newly_selected_id = None; mode = None
@@ -321,7 +464,7 @@ class SceneEditorApp:
                 if x2 - 15 < click_x < x2 + 15 and y2 - 15 < click_y < y2 + 15:
                     newly_selected_id, mode = selected['id'], "resize"
         if not newly_selected_id:
-            for asset_obj in reversed(sorted(self.placed_assets, key=lambda k: k['layer_index'])):
+            for asset_obj in reversed(self.placed_assets): # Topmost first
                 x1, y1, x2, y2 = asset_obj['bbox']
                 if x1 <= click_x <= x2 and y1 <= click_y <= y2:
                     newly_selected_id, mode = asset_obj['id'], "move"
@@ -329,71 +472,98 @@ class SceneEditorApp:
         self.selected_asset_id = newly_selected_id
         if self.selected_asset_id:
             self._drag_data = {'item_id': self.selected_asset_id, 'mode': mode, 'x': click_x, 'y': click_y}
-        self.redraw_canvas()
+        self._draw_overlay() # Only the selection changed, so the scene itself doesn't need redrawing
     def on_canvas_drag(self, event):
         if not self._drag_data.get("item_id"): return
+        # Tk sends many motion events per drawn frame: remember only the latest whole-pixel position and apply it once the event loop is idle.
+        # Motion that doesn't reach a new image pixel changes nothing, so it doesn't cause a redraw at all.
+        pos = self._display_to_image_coords(event.x, event.y)
+        if pos == (self._drag_data['x'], self._drag_data['y']): self._pending_drag = None; return
+        self._pending_drag = pos
+        if not self._drag_redraw_scheduled: self._drag_redraw_scheduled = True; self.root.after_idle(self._flush_drag)
+    def _flush_drag(self):
+        self._drag_redraw_scheduled = False
+        if self._apply_pending_drag(): self._interactive = True; self.redraw_canvas(with_title=False)
+    def _apply_pending_drag(self):
+        if self._pending_drag is None or not self._drag_data.get("item_id"): return False
+        (new_x, new_y), self._pending_drag = self._pending_drag, None
         item = self.get_asset_by_id(self._drag_data["item_id"])
-        if not item: return
-        new_x, new_y = self._display_to_image_coords(event.x, event.y)
+        if not item: return False
         if self._drag_data["mode"] == "rotate":
             center_x, center_y = item['bbox'][0] + (item['bbox'][2] - item['bbox'][0])/2, item['bbox'][1] + (item['bbox'][3] - item['bbox'][1])/2
             item['rotation'] = math.degrees(math.atan2(new_y - center_y, new_x - center_x)) + 90
         elif self._drag_data["mode"] == "move":
             item['x'] += new_x - self._drag_data['x']; item['y'] += new_y - self._drag_data['y']
         elif self._drag_data["mode"] == "resize":
-            img = self.asset_cache[item['path']]; old_w = img.width * item['scale']
+            img_w = self.asset_cache[item['path']].width * self._work_scale; old_w = img_w * item['scale']
             new_w = old_w + (new_x - self._drag_data['x'])
-            if new_w > 10: item['scale'] = new_w / img.width
+            if new_w > 10: item['scale'] = new_w / img_w
         self._drag_data['x'] = new_x; self._drag_data['y'] = new_y
-        self.redraw_canvas(with_title=False)
+        return True
     def on_canvas_release(self, event):
-        if self._drag_data.get('item_id'): self.redraw_canvas()
-        self._drag_data.clear()
+        was_dragging = self._drag_data.get('item_id')
+        if was_dragging: self._apply_pending_drag() # A last position that hasn't been drawn yet
+        self._drag_data.clear(); self._static_bg_cache = None; self._interactive = False
+        if was_dragging: self.redraw_canvas() # Full redraw, with the asset back in its own layer
     def get_placement_zone(self, W, H, w, h, zone):
-        zones = {"Top Left": ((0, W//3 - w), (0, H//3 - h)), "Top Center": ((W//3, 2*W//3 - w), (0, H//3 - h)),"Top Right": ((2*W//3, W - w), (0, H//3 - h)),"MiddleLeft": ((0, W//3 - w), (H//3, 2*H//3 - h)),"Center": ((W//3, 2*W//3 - w), (H//3, 2*H//3 - h)),"Middle Right": ((2*W//3, W - w), (H//3, 2*H//3 - h)),"Bottom Left": ((0, W//3 - w), (2*H//3, H - h)),"Bottom Center": ((W//3, 2*W//3 - w), (2*H//3, H - h)),"Bottom Right": ((2*W//3, W - w), (2*H//3, H - h)),"Top Half": ((0, W - w), (0, H//2 - h)),"Bottom Half": ((0, W - w), (H//2, H - h)),"Left Half": ((0, W//2 - w), (0, H - h)),"Right Half": ((W//2, W - w), (0, H - h)),}
-        x_r, y_r = zones.get(zone, ((0, W - w), (0, H - h)))
-        return (max(0, x_r[0]), max(0, x_r[1])), (max(0, y_r[0]), max(0, y_r[1]))
+        x0, x1, y0, y1 = PLACEMENT_ZONES.get(zone, (0, 6, 0, 6))
+        return (max(0, W*x0//6), max(0, W*x1//6 - w)), (max(0, H*y0//6), max(0, H*y1//6 - h))
     def load_background(self):
         path = filedialog.askopenfilename(filetypes=[("Images", "*.png *.jpg *.jpeg")])
         if not path: return
-        self.background_image = Image.open(path).convert("RGBA"); self.placed_assets.clear(); self.selected_asset_id = None
-        self._zoom_level = 1.0; self._view_x = 0; self._view_y = 0; self.redraw_canvas()
+        self._set_background(Image.open(path).convert("RGBA"))
         self.status_var.set(f"Loaded background: {os.path.basename(path)}")
     def generate_scene(self):
         if not self.background_image: messagebox.showerror("Error", "Load background first."); return
         self.status_var.set("Generating..."); self.root.update_idletasks()
-        self.placed_assets.clear(); self.selected_asset_id = None; W, H = self.background_image.size
+        self.placed_assets.clear(); self._assets_by_id.clear(); self.selected_asset_id = None; W, H = self._background_working.size
         for i, layer in enumerate(self.layers):
+            # Read the layer's Tk variables once; each .get() is a round-trip into the Tcl interpreter
+            s_lo, s_hi = layer["scale_min_var"].get(), layer["scale_max_var"].get(); min_s, max_s = min(s_lo, s_hi) / 100.0, max(s_lo, s_hi) / 100.0
+            r_lo, r_hi = layer["rot_min_var"].get(), layer["rot_max_var"].get(); min_r, max_r = min(r_lo, r_hi), max(r_lo, r_hi)
+            placement = layer["placement_var"].get()
             for item_id in layer["tree"].tag_has('checked'):
                 asset_path = layer["assets"][item_id]["path"]; count = int(layer["tree"].item(item_id, 'values')[1])
-                for _ in range(count):
-                    asset_img = self.asset_cache.get(asset_path);
-                    if not asset_img: continue
-                    min_s, max_s = min(layer["scale_min_var"].get(), layer["scale_max_var"].get()), max(layer["scale_min_var"].get(), layer["scale_max_var"].get())
-                    scale = random.uniform(min_s / 100.0, max_s / 100.0)
-                    min_r, max_r = min(layer["rot_min_var"].get(), layer["rot_max_var"].get()), max(layer["rot_min_var"].get(), layer["rot_max_var"].get())
-                    rotation = random.uniform(min_r, max_r)
-                    temp_img = asset_img.resize((int(asset_img.width*scale), int(asset_img.height*scale)), Image.Resampling.LANCZOS).rotate(rotation, expand=True)
-                    w,h = temp_img.size; x_r, y_r = self.get_placement_zone(W, H, w, h, layer["placement_var"].get())
+                if not self.asset_cache.get(asset_path): continue
+                # Position draws are fractions of the placement range, since the range depends on each asset's transformed size
+                scales, rotations = self._rng.uniform(min_s, max_s, count).tolist(), self._rng.uniform(min_r, max_r, count).tolist()
+                x_fracs, y_fracs = self._rng.random(count).tolist(), self._rng.random(count).tolist()
+                for scale, rotation, x_frac, y_frac in zip(scales, rotations, x_fracs, y_fracs):
+                    # Only the size is needed to place it; the pixels are transformed when the scene is drawn
+                    size = self._transformed_size(asset_path, scale * self._work_scale, rotation)
+                    if size is None: continue
+                    w, h = size; x_r, y_r = self.get_placement_zone(W, H, w, h, placement)
                     if x_r[1] < x_r[0] or y_r[1] < y_r[0]: continue
-                    x, y = (random.randint(*x_r), random.randint(*y_r))
-                    self.placed_assets.append({"id": str(uuid.uuid4()), "path": asset_path, "x": x, "y": y, "scale": scale, "rotation": rotation, "layer_index": i, "bbox": (x, y, x + w, y + h)})
+                    x, y = x_r[0] + int(x_frac * (x_r[1] - x_r[0] + 1)), y_r[0] + int(y_frac * (y_r[1] - y_r[0] + 1))
+                    asset_obj = {"id": str(uuid.uuid4()), "path": asset_path, "x": x, "y": y, "scale": scale, "rotation": rotation, "layer_index": i, "bbox": (x, y, x + w, y + h)}
+                    self.placed_assets.append(asset_obj); self._assets_by_id[asset_obj["id"]] = asset_obj
         self.redraw_canvas()
-    def create_new_canvas(self):
-        self.background_image = Image.new("RGBA", (1920, 1080), "#4682B4")
-        self.placed_assets.clear(); self.selected_asset_id = None
+    def create_new_canvas(self): self._set_background(Image.new("RGBA", (1920, 1080), "#4682B4"))
+    def _set_background(self, image):
+        # Editing works on a copy no bigger than the screen, so a large background doesn't make every redraw push 4x the pixels; save_scene goes back to the original
+        self.background_image = image
+        self._work_scale = min(1.0, self.root.winfo_screenwidth() / image.width, self.root.winfo_screenheight() / image.height)
+        if self._work_scale < 1.0: self._background_working = image.resize((max(1, round(image.width * self._work_scale)), max(1, round(image.height * self._work_scale))), Image.Resampling.LANCZOS)
+        else: self._background_working = image
+        self._background_array = None; self.placed_assets.clear(); self._assets_by_id.clear(); self.selected_asset_id = None
         self._zoom_level = 1.0; self._view_x = 0; self._view_y = 0; self.redraw_canvas()
     def save_scene(self):
         if not self.current_scene_image: return
         filepath = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG", "*.png"), ("JPEG", "*.jpg")])
         if not filepath: return
-        self.selected_asset_id = None; self.redraw_canvas() # Deselect before saving
-        img_to_save = self.generated_scene_no_title
+        self.selected_asset_id = None; self._draw_overlay() # Deselect before saving (the handles are canvas items, never part of the saved image)
+        img_to_save = self.generated_scene_no_title if self._work_scale == 1.0 else self._render_full_resolution()
         if filepath.lower().endswith(('.jpg', '.jpeg')): img_to_save = img_to_save.convert('RGB')
         img_to_save.save(filepath); self.status_var.set(f"Scene saved to {filepath}")
+    def _render_full_resolution(self):
+        # Composites the scene again on the original background, with working-pixel positions scaled back up
+        canvas = np.asarray(self.background_image.convert("RGBa")).copy()
+        for asset_obj in self.placed_assets:
+            transformed_img = self._get_transformed(asset_obj['path'], asset_obj['scale'], asset_obj['rotation'])
+            if transformed_img is not None: _composite_over(canvas, transformed_img, round(asset_obj['x'] / self._work_scale), round(asset_obj['y'] / self._work_scale))
+        return Image.frombuffer("RGBa", (canvas.shape[1], canvas.shape[0]), canvas, "raw", "RGBa", 0, 1).convert("RGBA")
     def get_asset_by_id(self, asset_id):
-        if not asset_id: return None
-        return next((asset for asset in self.placed_assets if asset['id'] == asset_id), None)
+        return self._assets_by_id.get(asset_id) if asset_id else None
     def handle_drop(self, event, layer_index): self.load_assets(layer_index, paths=self.root.tk.splitlist(event.data))
     def load_assets(self, layer_index, paths=None):
         if paths is None: paths = filedialog.askopenfilenames(title=f"Select assets", filetypes=[("PNG Images", "*.png")])
@@ -402,7 +572,10 @@ class SceneEditorApp:
         for path in paths:
             if path.lower().endswith('.png') and path not in self.asset_cache:
                 try:
-                    self.asset_cache[path] = Image.open(path).convert("RGBA")
+                    # Stored premultiplied ("RGBa"): resizing, rotating and _composite_over all work on that directly, so no per-redraw conversion is needed
+                    img = Image.open(path); img.load()
+                    if img.mode != "RGBA": img = img.convert("RGBA")
+                    self.asset_cache[path] = img.convert("RGBa")
                     item_id = layer["tree"].insert("", "end", values=(os.path.basename(path), 1), tags=('unchecked',))
                     layer["assets"][item_id] = {"path": path}; count += 1
                 except Exception as e: print(f"Asset load error: {e}")
@@ -418,12 +591,13 @@ class SceneEditorApp:
     def add_title(self): self.redraw_canvas()
     def delete_selected_asset(self, event=None):
         if self.selected_asset_id:
-            self.placed_assets = [p for p in self.placed_assets if p['id'] != self.selected_asset_id]
-            self.selected_asset_id = None; self.redraw_canvas()
+            self.placed_assets.remove(self._assets_by_id.pop(self.selected_asset_id))
+            self.selected_asset_id = None; self._static_bg_cache = None; self.redraw_canvas()
             self.status_var.set("Asset deleted.")
 
 # === 3. APPLICATION LAUNCHER ===
 if __name__ == "__main__":
+    if not PILLOW_SIMD: print(f"Pillow {PIL.__version__} found. For faster resizing, install Pillow-SIMD: pip uninstall pillow && pip install pillow-simd")
     root = TkinterDnD.Tk()
     app = SceneEditorApp(root)
     root.mainloop()
\ No newline at end of file